@@ -0,0 +1,234 @@
+"""
+Benchmarks the prerequisite checks against a synthetic AWS account.
+
+Runs offline: AWS API calls and the template download are answered
+in-process by FakeAws, and NS lookups by the local FakeDns server. Reports the
+import time of the CLI, the wall time of a full check_prerequisites run,
+and the wall time, API calls and peak memory of each check.
+
+Usage:
+    python benchmarks/bench_checks.py --instances 5000 --roles 1000
+"""
+import argparse
+import contextlib
+import io
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from argparse import Namespace
+from typing import Tuple
+from unittest import mock
+
+import boto3
+from prettytable import PrettyTable
+
+from co_support.prerequisites.core.answers import Answers
+from co_support.prerequisites.core.checks import (
+    build_prerequisites,
+    check_prerequisites,
+)
+from co_support.prerequisites.core.clients import Clients
+from co_support.prerequisites.core.delegation import DelegationVerifier
+from co_support.prerequisites.core.environment import Environment
+from co_support.prerequisites.core.profile import Profiler, timed
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fake_aws import (  # noqa: E402
+    FakeAws,
+    HOSTED_ZONE_ID,
+    HOSTING_DOMAIN,
+    REGION,
+    VPC_ID,
+)
+from fake_dns import FakeDns  # noqa: E402
+
+# Maximum cumulative import time of co_support.main in milliseconds.
+IMPORT_BUDGET_MS = 100.0
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=__doc__.split("\n\n")[0].strip(),
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument("--instances", type=int, default=5000,
+                        help="Number of running EC2 instances")
+    parser.add_argument("--instance-types", type=int, default=30,
+                        help="Number of distinct instance types in use")
+    parser.add_argument("--roles", type=int, default=1000,
+                        help="Number of IAM roles")
+    parser.add_argument("--subnets", type=int, default=500,
+                        help="Number of subnets in the existing VPC")
+    parser.add_argument("--records", type=int, default=10000,
+                        help="Number of record sets in the hosted zone")
+    parser.add_argument("--certificates", type=int, default=500,
+                        help="Number of ACM certificates")
+    parser.add_argument("--latency", type=float, default=0.01,
+                        help="Simulated latency of each API call in seconds")
+    parser.add_argument("--jobs", type=int, default=8,
+                        help="Concurrency of the full run")
+    parser.add_argument("--report", action="store_true",
+                        help="Print the report of the full run")
+    parser.add_argument("--import-budget", type=float,
+                        default=IMPORT_BUDGET_MS,
+                        help="Maximum import time of co_support.main in ms")
+    return parser.parse_args()
+
+
+def import_time() -> float:
+    """
+    Returns the cumulative import time of co_support.main in milliseconds,
+    as reported by python -X importtime in a fresh interpreter.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import co_support.main"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    match = re.search(
+        r"^import time:\s+\d+ \|\s+(\d+) \|\s*co_support\.main$",
+        result.stderr,
+        re.MULTILINE,
+    )
+    return int(match.group(1)) / 1000
+
+
+def environment(
+    fake: FakeAws,
+    fake_dns: FakeDns,
+    jobs: int,
+) -> Tuple[Namespace, Answers]:
+    """
+    Returns the command-line arguments and answers of a run against the
+    fake account, with a fresh client registry.
+    """
+    session = boto3.session.Session(
+        region_name=REGION,
+        aws_access_key_id="bench",
+        aws_secret_access_key="bench",
+    )
+    fake.attach(session)
+    profiler = Profiler()
+    clients = Clients(session, concurrency=jobs, profiler=profiler)
+    args = Namespace(
+        silent=True,
+        version="bench",
+        format="table",
+        stream=False,
+        watch=None,
+        watch_ttl=300.0,
+        output=None,
+        jobs=jobs,
+        profile=False,
+        regions=None,
+        accounts=None,
+        account_role="OrganizationAccountAccessRole",
+        offline=False,
+        dns_resolvers=[fake_dns.address],
+        dns_timeout=2.0,
+        profiler=profiler,
+        clients=clients,
+        env=Environment(clients),
+        delegation=DelegationVerifier(
+            [fake_dns.address],
+            2.0,
+            port=fake_dns.port,
+        ),
+    )
+    answers = Answers(
+        {
+            "version": "bench",
+            "role": "",
+            "domain": HOSTING_DOMAIN,
+            "zone": HOSTED_ZONE_ID,
+            "cert": "discover",
+            "private_ca": False,
+            "vpc": VPC_ID,
+            "internet_facing": True,
+        },
+        args,
+    )
+    return args, answers
+
+
+def api_calls(profiler: Profiler) -> int:
+    return sum(calls for _, calls, _ in profiler.operations())
+
+
+def main() -> int:
+    opts = parse_args()
+    fake = FakeAws(
+        instances=opts.instances,
+        instance_types=opts.instance_types,
+        roles=opts.roles,
+        subnets=opts.subnets,
+        records=opts.records,
+        certificates=opts.certificates,
+        latency=opts.latency,
+    )
+
+    import_ms = import_time()
+    print(
+        f"Import time of co_support.main: {import_ms:.1f} ms "
+        f"(budget {opts.import_budget:.0f} ms)"
+    )
+
+    with tempfile.TemporaryDirectory() as cache_home, mock.patch.dict(
+        os.environ, {"XDG_CACHE_HOME": cache_home},
+    ), mock.patch(
+        "co_support.prerequisites.core.templates.requests.get",
+        fake.get_template,
+    ), FakeDns(latency=opts.latency) as fake_dns:
+        args, answers = environment(fake, fake_dns, opts.jobs)
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()) as report:
+            check_prerequisites(answers, args)
+        if opts.report:
+            print(report.getvalue())
+        total = time.perf_counter() - start
+        print(
+            f"Full run with {opts.jobs} jobs: {total:.2f}s, "
+            f"{api_calls(args.profiler)} API calls"
+        )
+
+        args, answers = environment(fake, fake_dns, 1)
+        table = PrettyTable()
+        table.field_names = [
+            "Check", "Status", "Time (s)", "API calls", "Peak memory (KiB)",
+        ]
+        table.align = "r"
+        table.align["Check"] = "l"
+
+        tracemalloc.start()
+        for p in build_prerequisites(answers, args, args.env, [REGION]):
+            if p.skip():
+                table.add_row([p.name, "skipped", "", 0, 0])
+                continue
+
+            baseline = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            (passed, _), timing = timed(p.check)
+            peak = tracemalloc.get_traced_memory()[1] - baseline
+
+            status = "passed" if passed else "failed"
+            table.add_row([
+                p.name,
+                status,
+                f"{timing.duration:.3f}",
+                timing.api_calls,
+                f"{peak / 1024:.0f}",
+            ])
+        tracemalloc.stop()
+
+    print(table)
+    return 1 if import_ms > opts.import_budget else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
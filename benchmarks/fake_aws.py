@@ -0,0 +1,621 @@
+"""
+In-process stand-in for the AWS APIs used by the prerequisite checks.
+
+FakeAws answers boto3 calls from a synthetic account inventory of a
+configurable size, by short-circuiting the botocore "before-call" event.
+The real clients, parameter validation, paginators and error classes are
+exercised, but no request leaves the process.
+"""
+import json
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import quote
+
+from botocore.awsrequest import AWSResponse
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.x509.oid import NameOID
+
+ACCOUNT = "123456789012"
+REGION = "us-east-1"
+VPC_ID = "vpc-0bench00000000000"
+DEFAULT_VPC_ID = "vpc-0default000000000"
+HOSTED_ZONE_ID = "ZBENCH0000000000000"
+ZONE_NAME = "company.com"
+HOSTING_DOMAIN = f"codeocean.{ZONE_NAME}"
+CERTIFICATE_ARN = (
+    f"arn:aws:acm:{REGION}:{ACCOUNT}:certificate/"
+    "00000000-0000-0000-0000-000000000000"
+)
+NAME_SERVERS = [
+    "ns-1.awsdns-01.org",
+    "ns-2.awsdns-02.co.uk",
+    "ns-3.awsdns-03.com",
+    "ns-4.awsdns-04.net",
+]
+SERVICE_LINKED_ROLES = [
+    "autoscaling.amazonaws.com",
+    "batch.amazonaws.com",
+    "ecs.amazonaws.com",
+    "elasticfilesystem.amazonaws.com",
+    "elasticloadbalancing.amazonaws.com",
+    "es.amazonaws.com",
+    "rds.amazonaws.com",
+    "spot.amazonaws.com",
+]
+FAMILIES = ["m5", "c5", "r5", "t3", "g4dn", "g5", "vt1", "p3", "inf1"]
+SIZES = {"large": 2, "xlarge": 4, "2xlarge": 8, "4xlarge": 16}
+QUOTAS = {
+    ("ec2", "L-1216C47A"): 100000.0,
+    ("ec2", "L-DB2E81BA"): 100000.0,
+    ("ec2", "L-0263D0A3"): 5.0,
+    ("batch", "L-144F0CA5"): 50.0,
+}
+
+
+class FakeAws:
+    """
+    Synthetic AWS account answering the API calls of the checks.
+    """
+
+    def __init__(
+        self,
+        instances: int = 1000,
+        instance_types: int = 20,
+        roles: int = 200,
+        subnets: int = 100,
+        records: int = 1000,
+        certificates: int = 100,
+        latency: float = 0.0,
+    ) -> None:
+        self.instances = instances
+        self.types = [
+            f"{family}.{size}" for size in SIZES for family in FAMILIES
+        ][:max(1, instance_types)]
+        self.subnets = subnets
+        self.latency = latency
+        # Roles and record sets are generated upfront so that building
+        # them is not measured as part of the checks.
+        self.roles = [self._role(i, roles) for i in range(roles)]
+        self.record_sets = self._record_sets(records)
+        self.certificates = self._certificates(certificates)
+        self.certificate, self.certificate_chain = _certificate_chain()
+
+    def attach(self, session: Any) -> None:
+        """
+        Answers the API calls of every client later created from a boto3
+        session. The handler is registered last so that client-level
+        handlers, such as the profiler, still see every call.
+        """
+        session.events.register(
+            "before-parameter-build.*.*",
+            self._capture_params,
+        )
+        session.events.register_last("before-call.*.*", self._handle)
+
+    @staticmethod
+    def _capture_params(params: Dict, context: Dict, **kwargs) -> None:
+        # before-call only sees the serialized request, so the API
+        # parameters are kept in the request context beforehand.
+        context["fake_aws_params"] = dict(params)
+
+    def _handle(
+        self,
+        model: Any,
+        context: Dict,
+        **kwargs,
+    ) -> Tuple[AWSResponse, Dict]:
+        params = context.get("fake_aws_params", {})
+        if self.latency:
+            time.sleep(self.latency)
+
+        operation = f"{model.service_model.service_name}.{model.name}"
+        handler: Callable[[Dict], Dict] = getattr(
+            self,
+            "_" + operation.replace("-", "_").replace(".", "_"),
+            None,
+        )
+        if handler is None:
+            return _error(400, "UnsupportedOperation", operation)
+
+        try:
+            return AWSResponse(None, 200, {}, None), handler(params)
+        except FakeError as e:
+            return _error(e.status, e.code, str(e))
+
+    def get_template(self, url: str, headers: Dict = None, **kwargs) -> Any:
+        """
+        Serves the Code Ocean template in place of requests.get.
+        """
+        if self.latency:
+            time.sleep(self.latency)
+        etag = '"bench"'
+        if (headers or {}).get("If-None-Match") == etag:
+            return _HttpResponse(304, etag, "")
+        amis = "".join(
+            f"    {region}:\n      id: ami-0bench{i:08d}\n"
+            for i, region in enumerate([REGION, "eu-west-1", "ap-south-1"])
+        )
+        return _HttpResponse(200, etag, f"Mappings:\n  AMIs:\n{amis}")
+
+    # STS
+
+    def _sts_GetCallerIdentity(self, params: Dict) -> Dict:
+        return {
+            "Account": ACCOUNT,
+            "Arn": f"arn:aws:iam::{ACCOUNT}:role/Administrator",
+            "UserId": "AROABENCH",
+        }
+
+    # IAM
+
+    def _iam_ListRoles(self, params: Dict) -> Dict:
+        prefix = params.get("PathPrefix", "/")
+        # botocore decodes the policies of the response in place.
+        roles = [
+            dict(role) for role in self.roles
+            if role["Path"].startswith(prefix)
+        ]
+        page, marker = _page(roles, params.get("Marker"),
+                             params.get("MaxItems"), 100)
+        response = {"Roles": page, "IsTruncated": marker is not None}
+        if marker is not None:
+            response["Marker"] = marker
+        return response
+
+    @staticmethod
+    def _role(i: int, total: int) -> Dict:
+        # Service-linked roles are spread evenly through the listing.
+        step = max(1, total // len(SERVICE_LINKED_ROLES))
+        if i % step == step - 1 and i // step < len(SERVICE_LINKED_ROLES):
+            service = SERVICE_LINKED_ROLES[i // step]
+            path = f"/aws-service-role/{service}/"
+        else:
+            service = "ec2.amazonaws.com"
+            path = "/"
+        return {
+            "Path": path,
+            "RoleName": f"role-{i:06d}",
+            "RoleId": f"AROA{i:016d}",
+            "Arn": f"arn:aws:iam::{ACCOUNT}:role{path}role-{i:06d}",
+            "CreateDate": datetime(2024, 1, 1, tzinfo=timezone.utc),
+            # IAM returns URL-encoded policies, decoded by botocore.
+            "AssumeRolePolicyDocument": quote(json.dumps({
+                "Version": "2012-10-17",
+                "Statement": [{
+                    "Effect": "Allow",
+                    "Principal": {"Service": service},
+                    "Action": "sts:AssumeRole",
+                }],
+            })),
+        }
+
+    def _iam_ListAttachedRolePolicies(self, params: Dict) -> Dict:
+        return {
+            "AttachedPolicies": [{
+                "PolicyName": "AdministratorAccess",
+                "PolicyArn": "arn:aws:iam::aws:policy/AdministratorAccess",
+            }],
+            "IsTruncated": False,
+        }
+
+    _iam_ListAttachedUserPolicies = _iam_ListAttachedRolePolicies
+
+    # EC2
+
+    def _ec2_DescribeRegions(self, params: Dict) -> Dict:
+        return {"Regions": [{"RegionName": REGION}]}
+
+    def _ec2_DescribeImages(self, params: Dict) -> Dict:
+        return {
+            "Images": [
+                {"ImageId": image_id, "State": "available"}
+                for image_id in params.get("ImageIds", [])
+            ],
+        }
+
+    def _ec2_DescribeInstances(self, params: Dict) -> Dict:
+        start = int(params.get("NextToken") or 0)
+        size = min(int(params.get("MaxResults") or 1000), 1000)
+        end = min(start + size, self.instances)
+        reservations = [
+            {
+                "ReservationId": f"r-{i:017d}",
+                "Instances": [{
+                    "InstanceId": f"i-{i:017d}",
+                    "InstanceType": self.types[i % len(self.types)],
+                    "State": {"Name": "running"},
+                    # One instance in ten is a Spot Instance.
+                    **({"InstanceLifecycle": "spot"} if i % 10 == 9 else {}),
+                }],
+            }
+            for i in range(start, end)
+        ]
+        response = {"Reservations": reservations}
+        if end < self.instances:
+            response["NextToken"] = str(end)
+        return response
+
+    def _ec2_DescribeInstanceTypes(self, params: Dict) -> Dict:
+        names = params.get("InstanceTypes", [])
+        if len(names) > 100:
+            raise FakeError(
+                400,
+                "InvalidParameterValue",
+                "At most 100 instance types can be described at once.",
+            )
+        unknown = set(names) - set(self.types)
+        if unknown:
+            raise FakeError(
+                400,
+                "InvalidInstanceType",
+                f"Unknown instance types: {', '.join(sorted(unknown))}",
+            )
+        return {
+            "InstanceTypes": [
+                {
+                    "InstanceType": name,
+                    "VCpuInfo": {"DefaultVCpus": SIZES[name.split(".")[1]]},
+                }
+                for name in names
+            ],
+        }
+
+    def _ec2_DescribeVpcs(self, params: Dict) -> Dict:
+        vpcs = [
+            {
+                "VpcId": VPC_ID,
+                "IsDefault": False,
+                "DhcpOptionsId": "dopt-0bench",
+                "CidrBlock": "10.0.0.0/8",
+            },
+            {
+                "VpcId": DEFAULT_VPC_ID,
+                "IsDefault": True,
+                "DhcpOptionsId": "dopt-0bench",
+                "CidrBlock": "172.31.0.0/16",
+            },
+        ]
+        vpc_ids = params.get("VpcIds") or _filter_values(params, "vpc-id")
+        if vpc_ids:
+            vpcs = [vpc for vpc in vpcs if vpc["VpcId"] in vpc_ids]
+        is_default = _filter_values(params, "is-default")
+        if is_default:
+            vpcs = [
+                vpc for vpc in vpcs
+                if str(vpc["IsDefault"]).lower() in is_default
+            ]
+        return {"Vpcs": vpcs}
+
+    def _ec2_DescribeDhcpOptions(self, params: Dict) -> Dict:
+        return {
+            "DhcpOptions": [{
+                "DhcpOptionsId": "dopt-0bench",
+                "DhcpConfigurations": [{
+                    "Key": "domain-name-servers",
+                    "Values": [{"Value": "AmazonProvidedDNS"}],
+                }],
+            }],
+        }
+
+    def _ec2_DescribeSubnets(self, params: Dict) -> Dict:
+        if VPC_ID not in _filter_values(params, "vpc-id"):
+            return {"Subnets": []}
+        subnets = [self._subnet(i) for i in range(self.subnets)]
+        page, token = _page(subnets, params.get("NextToken"),
+                            params.get("MaxResults"), len(subnets) or 1)
+        response = {"Subnets": page}
+        if token is not None:
+            response["NextToken"] = token
+        return response
+
+    def _subnet(self, i: int) -> Dict:
+        return {
+            "SubnetId": f"subnet-{i:017d}",
+            "VpcId": VPC_ID,
+            "CidrBlock": f"10.{i // 256}.{i % 256}.0/24",
+            "MapPublicIpOnLaunch": i % 2 == 1,
+        }
+
+    def _ec2_DescribeRouteTables(self, params: Dict) -> Dict:
+        if VPC_ID not in _filter_values(params, "vpc-id"):
+            return {"RouteTables": []}
+        public = [
+            {"SubnetId": f"subnet-{i:017d}", "Main": False}
+            for i in range(1, self.subnets, 2)
+        ]
+        route_tables = [
+            {
+                "RouteTableId": "rtb-0main",
+                "VpcId": VPC_ID,
+                "Associations": [{"Main": True}],
+                "Routes": [{"DestinationCidrBlock": "10.0.0.0/8",
+                            "GatewayId": "local"}],
+            },
+            {
+                "RouteTableId": "rtb-0public",
+                "VpcId": VPC_ID,
+                "Associations": public,
+                "Routes": [{"DestinationCidrBlock": "0.0.0.0/0",
+                            "GatewayId": "igw-0bench"}],
+            },
+        ]
+        page, token = _page(route_tables, params.get("NextToken"),
+                            params.get("MaxResults"), len(route_tables))
+        response = {"RouteTables": page}
+        if token is not None:
+            response["NextToken"] = token
+        return response
+
+    def _ec2_DescribeAddresses(self, params: Dict) -> Dict:
+        return {"Addresses": [{"PublicIp": "203.0.113.1"}]}
+
+    # Service Quotas
+
+    def _service_quotas_GetServiceQuota(self, params: Dict) -> Dict:
+        key = (params["ServiceCode"], params["QuotaCode"])
+        if key not in QUOTAS:
+            raise FakeError(400, "NoSuchResourceException", str(key))
+        return {"Quota": _quota(*key)}
+
+    _service_quotas_GetAWSDefaultServiceQuota = (
+        _service_quotas_GetServiceQuota
+    )
+
+    def _service_quotas_ListServiceQuotas(self, params: Dict) -> Dict:
+        quotas = [
+            _quota(service, code)
+            for service, code in QUOTAS
+            if service == params["ServiceCode"]
+        ]
+        page, token = _page(quotas, params.get("NextToken"),
+                            params.get("MaxResults"), 100)
+        response = {"Quotas": page}
+        if token is not None:
+            response["NextToken"] = token
+        return response
+
+    # Batch
+
+    def _batch_DescribeComputeEnvironments(self, params: Dict) -> Dict:
+        return {
+            "computeEnvironments": [
+                {"computeEnvironmentName": f"ce-{i}"} for i in range(3)
+            ],
+        }
+
+    # Route 53
+
+    def _route53_GetHostedZone(self, params: Dict) -> Dict:
+        return {
+            "HostedZone": {
+                "Id": f"/hostedzone/{HOSTED_ZONE_ID}",
+                "Name": f"{ZONE_NAME}.",
+                "CallerReference": "bench",
+                "Config": {"PrivateZone": False},
+            },
+            "DelegationSet": {"NameServers": NAME_SERVERS},
+        }
+
+    def _route53_ListResourceRecordSets(self, params: Dict) -> Dict:
+        records = self.record_sets
+        start = 0
+        if params.get("StartRecordName"):
+            key = _record_key(
+                params["StartRecordName"],
+                params.get("StartRecordType", ""),
+            )
+            start = next(
+                (i for i, record in enumerate(records)
+                 if _record_key(record["Name"], record["Type"]) >= key),
+                len(records),
+            )
+        size = min(int(params.get("MaxItems") or 300), 300)
+        page = records[start:start + size]
+        response = {
+            "ResourceRecordSets": page,
+            "IsTruncated": start + size < len(records),
+            "MaxItems": str(size),
+        }
+        if response["IsTruncated"]:
+            response["NextRecordName"] = records[start + size]["Name"]
+            response["NextRecordType"] = records[start + size]["Type"]
+        return response
+
+    @staticmethod
+    def _record_sets(total: int) -> List[Dict]:
+        records = [
+            {"Name": f"{ZONE_NAME}.", "Type": "NS", "TTL": 172800,
+             "ResourceRecords": [{"Value": f"{ns}."} for ns in NAME_SERVERS]},
+            {"Name": f"{ZONE_NAME}.", "Type": "SOA", "TTL": 900,
+             "ResourceRecords": [{"Value": "ns-1.awsdns-01.org."}]},
+        ]
+        records += [
+            {"Name": f"host-{i:06d}.{ZONE_NAME}.", "Type": "A", "TTL": 300,
+             "ResourceRecords": [{"Value": "203.0.113.10"}]}
+            for i in range(total)
+        ]
+        records.sort(key=lambda r: _record_key(r["Name"], r["Type"]))
+        return records
+
+    # ACM
+
+    def _acm_ListCertificates(self, params: Dict) -> Dict:
+        statuses = params.get("CertificateStatuses") or ["ISSUED"]
+        summaries = [
+            {
+                "CertificateArn": cert["CertificateArn"],
+                "DomainName": cert["DomainName"],
+                "SubjectAlternativeNameSummaries":
+                    cert["SubjectAlternativeNames"],
+                "HasAdditionalSubjectAlternativeNames": False,
+                "Status": cert["Status"],
+                "NotAfter": cert["NotAfter"],
+            }
+            for cert in self.certificates.values()
+            if cert["Status"] in statuses
+        ]
+        page, token = _page(summaries, params.get("NextToken"),
+                            params.get("MaxItems"), 100)
+        response = {"CertificateSummaryList": page}
+        if token is not None:
+            response["NextToken"] = token
+        return response
+
+    def _acm_DescribeCertificate(self, params: Dict) -> Dict:
+        cert = self.certificates.get(params["CertificateArn"])
+        if not cert:
+            raise FakeError(400, "ResourceNotFoundException",
+                            params["CertificateArn"])
+        return {"Certificate": cert}
+
+    @staticmethod
+    def _certificates(total: int) -> Dict[str, Dict]:
+        # Besides CERTIFICATE_ARN, one certificate in 50 only covers the
+        # apex of the hosting domain, and another expires sooner.
+        now = datetime.now(timezone.utc)
+        certificates = {}
+        for i in range(max(1, total)):
+            arn = CERTIFICATE_ARN if i == 0 else CERTIFICATE_ARN.replace(
+                "000000000000", f"{i:012d}"
+            )
+            if i == 0:
+                names, days = [HOSTING_DOMAIN, f"*.{HOSTING_DOMAIN}"], 90
+            elif i % 50 == 1:
+                names, days = [HOSTING_DOMAIN], 365
+            elif i % 50 == 2:
+                names, days = [HOSTING_DOMAIN, f"*.{HOSTING_DOMAIN}"], 30
+            else:
+                names, days = [f"site-{i:06d}.example.org"], 365
+            certificates[arn] = {
+                "CertificateArn": arn,
+                "DomainName": names[0],
+                "SubjectAlternativeNames": names,
+                "Status": "EXPIRED" if i % 10 == 9 else "ISSUED",
+                "NotAfter": now + timedelta(days=days),
+            }
+        return certificates
+
+    def _acm_GetCertificate(self, params: Dict) -> Dict:
+        return {
+            "Certificate": self.certificate,
+            "CertificateChain": self.certificate_chain,
+        }
+
+    # Organizations
+
+    def _organizations_ListAccounts(self, params: Dict) -> Dict:
+        return {
+            "Accounts": [{"Id": ACCOUNT, "Status": "ACTIVE"}],
+        }
+
+
+class _HttpResponse:
+    def __init__(self, status_code: int, etag: str, text: str) -> None:
+        self.status_code = status_code
+        self.headers = {"ETag": etag}
+        self.text = text
+
+    def raise_for_status(self) -> None:
+        pass
+
+
+class FakeError(Exception):
+    """
+    AWS error returned by the fake backend.
+    """
+
+    def __init__(self, status: int, code: str, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+        self.code = code
+
+
+def _error(status: int, code: str, message: str) -> Tuple[AWSResponse, Dict]:
+    return AWSResponse(None, status, {}, None), {
+        "Error": {"Code": code, "Message": message},
+        "ResponseMetadata": {"HTTPStatusCode": status},
+    }
+
+
+def _page(
+    items: List,
+    token: Optional[str],
+    max_items: Optional[Any],
+    default: int,
+) -> Tuple[List, Optional[str]]:
+    """
+    Returns a page of items and the token of the next page, if any.
+    """
+    start = int(token or 0)
+    end = start + int(max_items or default)
+    return items[start:end], (str(end) if end < len(items) else None)
+
+
+def _filter_values(params: Dict, name: str) -> List[str]:
+    for f in params.get("Filters", []):
+        if f["Name"] == name:
+            return f["Values"]
+    return []
+
+
+def _quota(service: str, code: str) -> Dict:
+    return {
+        "ServiceCode": service,
+        "QuotaCode": code,
+        "QuotaName": code,
+        "Value": QUOTAS[(service, code)],
+    }
+
+
+def _certificate_chain() -> Tuple[str, str]:
+    """
+    Returns a PEM certificate of the hosting domain and the PEM chain of
+    its intermediate and root CAs.
+    """
+    now = datetime.now(timezone.utc)
+    keys = [ec.generate_private_key(ec.SECP256R1()) for _ in range(3)]
+    names = [
+        x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, common_name)])
+        for common_name in ["Bench Root CA", "Bench CA", HOSTING_DOMAIN]
+    ]
+    certs = []
+    for i, (key, name) in enumerate(zip(keys, names)):
+        issuer = max(i - 1, 0)
+        builder = (
+            x509.CertificateBuilder()
+            .subject_name(name)
+            .issuer_name(names[issuer])
+            .public_key(key.public_key())
+            .serial_number(x509.random_serial_number())
+            .not_valid_before(now - timedelta(days=1))
+            .not_valid_after(now + timedelta(days=90))
+            .add_extension(
+                x509.BasicConstraints(ca=i < 2, path_length=None),
+                critical=True,
+            )
+        )
+        if i == 2:
+            builder = builder.add_extension(
+                x509.SubjectAlternativeName([
+                    x509.DNSName(HOSTING_DOMAIN),
+                    x509.DNSName(f"*.{HOSTING_DOMAIN}"),
+                ]),
+                critical=False,
+            )
+        certs.append(builder.sign(keys[issuer], hashes.SHA256()))
+
+    pem = [
+        cert.public_bytes(serialization.Encoding.PEM).decode()
+        for cert in certs
+    ]
+    return pem[2], pem[1] + pem[0]
+
+
+def _record_key(name: str, record_type: str) -> Tuple[List[str], str]:
+    """
+    Sorts record sets the way Route 53 lists them, by reversed labels.
+    """
+    return list(reversed(name.rstrip(".").split("."))), record_type
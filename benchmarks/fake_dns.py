@@ -0,0 +1,110 @@
+"""
+Local DNS server standing in for the resolvers and the parent zone.
+
+FakeDns listens on a random UDP port of the loopback interface and acts
+both as a recursive resolver and as the authoritative server of the parent
+zone of the hosted zone, so that the delegation checks send real DNS
+queries without leaving the machine.
+"""
+import socketserver
+import threading
+import time
+from typing import Any, List
+
+import dns.flags
+import dns.message
+import dns.name
+import dns.rcode
+import dns.rdatatype
+import dns.rrset
+
+from fake_aws import NAME_SERVERS, ZONE_NAME
+
+PARENT_NAME_SERVER = "ns.parent.test."
+TTL = 300
+
+
+class FakeDns:
+    """
+    DNS server answering the NS queries of the hosted zone.
+    """
+
+    def __init__(
+        self,
+        name_servers: List[str] = NAME_SERVERS,
+        latency: float = 0.0,
+    ) -> None:
+        self.name_servers = name_servers
+        self.latency = latency
+        self.queries = 0
+        self._server = socketserver.ThreadingUDPServer(
+            ("127.0.0.1", 0), self._handler(),
+        )
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, daemon=True,
+        )
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    @property
+    def address(self) -> str:
+        return f"127.0.0.1:{self.port}"
+
+    def __enter__(self) -> "FakeDns":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def answer(self, query: dns.message.Message) -> dns.message.Message:
+        """
+        Answers a query as a resolver when recursion is desired, and as the
+        authoritative server of the parent zone otherwise.
+        """
+        self.queries += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+        response = dns.message.make_response(query)
+        question = query.question[0]
+        name = question.name.to_text().lower()
+        recursive = bool(query.flags & dns.flags.RD)
+
+        if question.rdtype == dns.rdatatype.NS and name == f"{ZONE_NAME}.":
+            rrset = dns.rrset.from_text_list(
+                question.name, TTL, "IN", "NS",
+                [f"{ns}." for ns in self.name_servers],
+            )
+            # The parent zone answers with a referral.
+            (response.answer if recursive else response.authority).append(
+                rrset
+            )
+        elif question.rdtype == dns.rdatatype.NS and name == (
+            dns.name.from_text(ZONE_NAME).parent().to_text()
+        ):
+            response.answer.append(dns.rrset.from_text(
+                question.name, TTL, "IN", "NS", PARENT_NAME_SERVER,
+            ))
+        elif question.rdtype == dns.rdatatype.A and name == PARENT_NAME_SERVER:
+            response.answer.append(dns.rrset.from_text(
+                question.name, TTL, "IN", "A", "127.0.0.1",
+            ))
+        else:
+            response.set_rcode(dns.rcode.NXDOMAIN)
+        return response
+
+    def _handler(self) -> Any:
+        fake = self
+
+        class Handler(socketserver.BaseRequestHandler):
+            def handle(self) -> None:
+                data, sock = self.request
+                response = fake.answer(dns.message.from_wire(data))
+                sock.sendto(response.to_wire(), self.client_address)
+
+        return Handler
@@ -1,16 +1,18 @@
-import boto3
-import requests
-import yaml
-
 from botocore.exceptions import ClientError
-from typing import Set, Tuple
+from typing import List, Set, Tuple
 
-from co_support.prerequisites.core.prerequisite import Prerequisite
+from co_support.prerequisites.core.clients import Clients
+from co_support.prerequisites.core.prerequisite import (
+    Prerequisite,
+    Provider,
+)
+from co_support.prerequisites.core.templates import TemplateCache
 
 
 class LinkedRolesCheck(Prerequisite):
     def __init__(
         self,
+        clients: Clients,
     ) -> None:
         super().__init__(
             name="Service Linked Roles",
@@ -18,13 +20,14 @@ class LinkedRolesCheck(Prerequisite):
                 "Checks if the required AWS service-linked roles exist."
             ),
             reference="tinyurl.com/ycyk9fr9",
+            clients=clients,
         )
 
     def check(self) -> Tuple[bool, str]:
         """
         Verifies the existence of required service-linked roles.
         """
-        iam_client = boto3.client("iam")
+        iam_client = self.clients.client("iam")
         existing_roles: Set[str] = set()
         roles_set: Set[str] = set([
             "autoscaling.amazonaws.com",
@@ -38,20 +41,23 @@ class LinkedRolesCheck(Prerequisite):
         ])
 
         try:
-            for role in iam_client.list_roles()["Roles"]:
-                if (
-                    not role.get("Path", "").startswith("/aws-service-role/")
-                    and not role.get("AssumeRolePolicyDocument")
-                ):
-                    continue
-
-                statements = role[
-                    "AssumeRolePolicyDocument"
-                ].get("Statement", [])
-                for statement in statements:
-                    principal = statement.get("Principal", {})
-                    service = principal.get("Service", "")
-                    existing_roles.add(service)
+            # Service-linked roles all live under this path, so the listing
+            # is narrowed server-side and stops once every role is found.
+            paginator = iam_client.get_paginator("list_roles")
+            for page in paginator.paginate(PathPrefix="/aws-service-role/"):
+                for role in page["Roles"]:
+                    statements = role.get(
+                        "AssumeRolePolicyDocument", {}
+                    ).get("Statement", [])
+                    for statement in statements:
+                        principal = statement.get("Principal", {})
+                        service = principal.get("Service", [])
+                        if isinstance(service, str):
+                            service = [service]
+                        existing_roles.update(service)
+
+                if roles_set <= existing_roles:
+                    break
         except ClientError as e:
             return False, f"Error fetching roles: {e}"
 
@@ -67,6 +73,7 @@ class LinkedRolesCheck(Prerequisite):
 class AdminAccessCheck(Prerequisite):
     def __init__(
         self,
+        clients: Clients,
         role_arn: str,
     ) -> None:
         super().__init__(
@@ -76,21 +83,18 @@ class AdminAccessCheck(Prerequisite):
                 "AdministratorAccess policy attached."
             ),
             reference="tinyurl.com/4cp49xmp",
+            clients=clients,
         )
         self.role_arn = role_arn
 
     def check(self) -> Tuple[bool, str]:
         """
-        Determines whether the current user or a given role
+        Determines whether the role deploying the template
         has administrator access.
         """
-        iam_client = boto3.client("iam")
-        sts_client = boto3.client("sts")
+        iam_client = self.clients.client("iam")
 
         try:
-            if not self.role_arn:
-                self.role_arn = sts_client.get_caller_identity()["Arn"]
-
             role_name = self.role_arn.split("/")[-1]
 
             if role_name == "CodeOceanLeastPrivilegedDeployRole":
@@ -133,9 +137,11 @@ class AdminAccessCheck(Prerequisite):
 class SharedAmiCheck(Prerequisite):
     def __init__(
         self,
+        clients: Clients,
         version: str,
         region: str,
         account: str,
+        templates: TemplateCache,
     ) -> None:
         super().__init__(
             name="Shared AMI",
@@ -144,34 +150,30 @@ class SharedAmiCheck(Prerequisite):
                 "the account in the specified region."
             ),
             reference="tinyurl.com/mrusuenn",
+            clients=clients,
+            region=region,
         )
         self.version = version
-        self.region = region
         self.account = account
+        self.templates = templates
+
+    def providers(self) -> List[Provider]:
+        return [(self.templates.amis, self.version)]
 
     def check(self) -> Tuple[bool, str]:
         """
         Checks if the AMI is shared with the current account
         in the specified region.
         """
-        yaml_url = (
-            "https://codeocean-vpc.s3.amazonaws.com/templates/"
-            f"{self.version}/codeocean.template.yaml"
-        )
-
         try:
-            yaml_content = yaml.safe_load(requests.get(yaml_url, "").text)
-            mappings = yaml_content.get("Mappings", {})
-            ami_id = mappings.get(
-                "AMIs", {},
-            ).get(self.region, {}).get("id", "")
+            ami_id = self.templates.amis(self.version).get(self.region, "")
             if not ami_id:
                 return False, (
                     f"The current region {self.region} is not supported"
                     "in this version"
                 )
 
-            ec2_client = boto3.client("ec2")
+            ec2_client = self.clients.client("ec2", self.region)
             try:
                 response = ec2_client.describe_images(
                     ImageIds=[ami_id],
@@ -1,24 +1,32 @@
-import os
-import subprocess
-import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from typing import Tuple
 
-import boto3
-import dns.resolver
-
-from co_support.prerequisites.core.prerequisite import (
-    SKIP_PREREQ,
-    Prerequisite
+from co_support.prerequisites.core.certificates import (
+    coverage,
+    discover_certificates,
+    required_names,
+    verify_chain,
 )
+from co_support.prerequisites.core.clients import Clients
+from co_support.prerequisites.core.delegation import DelegationVerifier
+from co_support.prerequisites.core.prerequisite import Prerequisite
+from co_support.prerequisites.core.profile import in_context
+
+# Value of --cert that searches ACM for the certificate of the domain.
+DISCOVER_CERT = "discover"
 
 
 class HostedZoneCheck(Prerequisite):
+    inputs = ("hosting_domain", "hosted_zone_id")
+
     def __init__(
         self,
+        clients: Clients,
         hosting_domain: str,
         hosted_zone_id: str,
         internet_facing: bool,
+        delegation: DelegationVerifier,
     ) -> None:
         super().__init__(
             name="Hosted Zone",
@@ -27,19 +35,18 @@ class HostedZoneCheck(Prerequisite):
                  "are correctly configured."
             ),
             reference="tinyurl.com/vsnm7avd",
+            clients=clients,
         )
         self.hosting_domain = hosting_domain
         self.hosted_zone_id = hosted_zone_id
         self.internet_facing = internet_facing
+        self.delegation = delegation
 
     def check(self) -> Tuple[bool, str]:
         """
         Checks if the provided hosted zone and domain are valid
         and properly configured.
         """
-        if not self.hosting_domain or not self.hosted_zone_id:
-            return SKIP_PREREQ
-
         domain_parts = self.hosting_domain.split(".")
         second_level_domain = ".".join(domain_parts[1:])
 
@@ -49,7 +56,7 @@ class HostedZoneCheck(Prerequisite):
                 "Expected a subdomain structure (e.g., codeocean.company.com)."
             )
 
-        route53_client = boto3.client("route53")
+        route53_client = self.clients.client("route53")
 
         try:
             zone_details = route53_client.get_hosted_zone(
@@ -87,48 +94,60 @@ class HostedZoneCheck(Prerequisite):
             return False, f"Error accessing hosted zone: {str(e)}"
 
         try:
-            resolved_ns_record = dns.resolver.resolve(zone_name, "NS")
-            resolved_name_servers = [
-                name_server.to_text().rstrip('.')
-                for name_server in resolved_ns_record
-            ]
-            if not resolved_name_servers:
+            answers = self.delegation.name_servers(zone_name)
+            resolved = [answer for answer in answers if not answer.error]
+            if not resolved:
                 return False, (
                     f"Delegation is not configured correctly. The NS "
-                    f"record for the domain {zone_name} is not resolvable."
+                    f"record for the domain {zone_name} is not resolvable: "
+                    + "; ".join(
+                        f"{answer.server} ({answer.error})"
+                        for answer in answers
+                    )
                 )
-            zone_name_servers = zone_details.get(
-                "DelegationSet",
-                {},
-            ).get("NameServers", [])
+            zone_name_servers = set(
+                name_server.rstrip(".").lower()
+                for name_server in zone_details.get(
+                    "DelegationSet",
+                    {},
+                ).get("NameServers", [])
+            )
 
-            if set(resolved_name_servers) != set(zone_name_servers):
+            disagreeing = [
+                answer for answer in resolved
+                if set(answer.name_servers) != zone_name_servers
+            ]
+            if disagreeing:
                 return False, (
                     f"Domain {zone_name} name servers do not match "
-                    f"the NS record of the hosted zone {self.hosted_zone_id}."
+                    f"the NS record of the hosted zone {self.hosted_zone_id}. "
+                    "Disagreeing servers: "
+                    + "; ".join(
+                        f"{answer.server} ({', '.join(answer.name_servers)})"
+                        for answer in disagreeing
+                    )
                 )
         except Exception as e:
             return False, f"Error while resolving NS records: {str(e)}"
 
-        try:
-            record_sets = route53_client.list_resource_record_sets(
-                HostedZoneId=self.hosted_zone_id
-            )
-            a_records = set([
-                record["Name"] for record in record_sets.get(
-                    "ResourceRecordSets",
-                    [],
-                )
-                if record.get("Type") == "A"
-            ])
-
-            records_to_check = set([
-                f"{self.hosting_domain}.",
-                f"registry.{self.hosting_domain}.",
-                f"analytics.{self.hosting_domain}."
-            ])
+        records_to_check = [
+            f"{self.hosting_domain}.",
+            f"registry.{self.hosting_domain}.",
+            f"analytics.{self.hosting_domain}.",
+        ]
 
-            if records_to_check & a_records:
+        try:
+            with ThreadPoolExecutor(
+                max_workers=len(records_to_check)
+            ) as executor:
+                found = list(executor.map(
+                    in_context(
+                        lambda name: self._has_a_record(route53_client, name)
+                    ),
+                    records_to_check,
+                ))
+
+            if any(found):
                 return False, (
                     "One of the Code Ocean A records was found in the hosted "
                     "zone. These records should not be present and are "
@@ -141,10 +160,31 @@ class HostedZoneCheck(Prerequisite):
             "Hosted zone is valid and properly configured."
         )
 
+    def _has_a_record(self, route53_client, name: str) -> bool:
+        """
+        Checks if the hosted zone has an A record with the given name,
+        seeking directly to it instead of listing the whole zone.
+        """
+        record_sets = route53_client.list_resource_record_sets(
+            HostedZoneId=self.hosted_zone_id,
+            StartRecordName=name,
+            StartRecordType="A",
+            MaxItems="1",
+        ).get("ResourceRecordSets", [])
+
+        return any(
+            record["Name"].lower() == name.lower()
+            and record.get("Type") == "A"
+            for record in record_sets
+        )
+
 
 class CertificateCheck(Prerequisite):
+    inputs = ("cert_arn", "hosting_domain")
+
     def __init__(
         self,
+        clients: Clients,
         cert_arn: str,
         hosting_domain: str,
         private_ca: bool,
@@ -155,6 +195,9 @@ class CertificateCheck(Prerequisite):
                 "Validates the SSL/TLS certificate and its chain of trust."
             ),
             reference="tinyurl.com/bdfp2a4s",
+            clients=clients,
+            # ACM certificates are regional.
+            region=clients.region,
         )
         self.cert_arn = cert_arn
         self.hosting_domain = hosting_domain
@@ -162,33 +205,40 @@ class CertificateCheck(Prerequisite):
 
     def check(self) -> Tuple[bool, str]:
         """
-        Validates the provided certificate ARN and checks its expiration
-        and chain validity.
+        Validates the provided certificate ARN, or the best certificate of
+        the domain found in ACM, and checks its expiration and chain
+        validity.
         """
-        if not self.cert_arn or not self.hosting_domain:
-            return SKIP_PREREQ
-
-        acm = boto3.client("acm")
+        acm = self.clients.client("acm")
 
         try:
-            cert_details = acm.describe_certificate(
-                CertificateArn=self.cert_arn
-            )
-            subject_alternative_names = set(cert_details["Certificate"].get(
-                "SubjectAlternativeNames",
-                [],
-            ))
-            required_names = set([
-                self.hosting_domain,
-                f"*.{self.hosting_domain}"
-            ])
-            if not required_names.issubset(subject_alternative_names):
+            if self.cert_arn == DISCOVER_CERT:
+                candidates = discover_certificates(
+                    self.clients,
+                    self.hosting_domain,
+                )
+                if not candidates:
+                    return False, (
+                        "No issued ACM certificate covers the domain "
+                        f"{self.hosting_domain}."
+                    )
+                cert_details = candidates[0]
+                cert_arn = cert_details["CertificateArn"]
+            else:
+                cert_details = acm.describe_certificate(
+                    CertificateArn=self.cert_arn
+                )["Certificate"]
+                cert_arn = self.cert_arn
+
+            names = required_names(self.hosting_domain)
+            sans = cert_details.get("SubjectAlternativeNames", [])
+            if coverage(sans, self.hosting_domain) < len(names):
                 return False, (
-                    f"Certificate does not cover the required domains: "
-                    f"{', '.join(required_names)}."
+                    f"Certificate {cert_arn} does not cover the required "
+                    f"domains: {', '.join(names)}."
                 )
 
-            expires = cert_details["Certificate"].get("NotAfter")
+            expires = cert_details.get("NotAfter")
             if not expires:
                 return False, "Certificate expiration date not found."
 
@@ -196,50 +246,34 @@ class CertificateCheck(Prerequisite):
             if days_left <= 0:
                 return False, "Certificate is expired."
 
-            cert = acm.get_certificate(CertificateArn=self.cert_arn)
+            cert = acm.get_certificate(CertificateArn=cert_arn)
             cert_pem = cert.get("Certificate")
             chain_pem = cert.get("CertificateChain")
 
             if not cert_pem:
                 return False, "Certificate body not found."
 
-            with tempfile.NamedTemporaryFile(
-                delete=False, mode="w", suffix=".pem"
-            ) as cert_file:
-                cert_file.write(cert_pem)
-                cert_path = cert_file.name
-
             if chain_pem:
-                with tempfile.NamedTemporaryFile(
-                    delete=False, mode="w", suffix=".pem"
-                ) as chain_file:
-                    chain_file.write(chain_pem)
-                    chain_path = chain_file.name
-
-                openssl_cmd = ["openssl", "verify"]
-                if not self.private_ca:
-                    openssl_cmd.append("-partial_chain")
-                openssl_cmd += ["-CAfile", chain_path, cert_path]
-
-                result = subprocess.run(
-                    openssl_cmd, capture_output=True, text=True
-                )
-
-                if result.returncode != 0:
-                    return False, "Certificate verification failed."
+                try:
+                    verify_chain(
+                        cert_pem,
+                        chain_pem,
+                        partial_chain=not self.private_ca,
+                    )
+                except ValueError as e:
+                    return False, f"Certificate verification failed: {str(e)}"
             elif not self.private_ca:
                 return False, (
                     "Missing certificate chain for "
                     "public certificate."
                 )
 
+            if self.cert_arn == DISCOVER_CERT:
+                return True, (
+                    f"Certificate {cert_arn} is valid, best of "
+                    f"{len(candidates)} certificates covering the domain."
+                )
             return True, "Certificate is valid."
 
         except Exception as e:
             return False, f"Error while checking certificate: {str(e)}"
-
-        finally:
-            if "cert_path" in locals() and os.path.exists(cert_path):
-                os.remove(cert_path)
-            if "chain_path" in locals() and os.path.exists(chain_path):
-                os.remove(chain_path)
@@ -1,18 +1,25 @@
-from typing import Tuple
-
-import boto3
+from typing import Dict, Hashable, List, Set, Tuple
 
+from co_support.prerequisites.core.clients import Clients
 from co_support.prerequisites.core.prerequisite import (
-    SKIP_PREREQ,
-    Prerequisite
+    Prerequisite,
+    Provider,
 )
+from co_support.prerequisites.core.topology import VpcTopology
+
+# Maximum number of subnet route errors included in a result.
+MAX_REPORTED_ERRORS = 5
 
 
 class ExistingVpcCheck(Prerequisite):
+    inputs = ("vpc_id",)
+
     def __init__(
         self,
+        clients: Clients,
         vpc_id: str,
-        internet_facing: bool
+        internet_facing: bool,
+        topology: VpcTopology,
     ) -> None:
         super().__init__(
             name="Existing VPC",
@@ -21,129 +28,122 @@ class ExistingVpcCheck(Prerequisite):
                 "internet access configurations."
             ),
             reference="tinyurl.com/yzxf4yv2",
+            clients=clients,
+            # The VPC is looked up in the session region.
+            region=topology.region,
         )
         self.vpc_id = vpc_id
         self.internet_facing = internet_facing
+        self.topology = topology
+
+    def providers(self) -> List[Provider]:
+        if self.internet_facing:
+            return [(self.topology.route_tables,)]
+        return [(self.topology.vpc,)]
 
     def check(self) -> Tuple[bool, str]:
         """
         Checks if the specified VPC exists and meets the required subnet
         and internet access configurations.
         """
-        if not self.vpc_id:
-            return SKIP_PREREQ
-
-        ec2_client = boto3.client("ec2")
-
         try:
-            vpc_response = ec2_client.describe_vpcs(VpcIds=[self.vpc_id])
+            vpc = self.topology.vpc()
         except Exception as e:
             return False, f"Error describing VPCs: {str(e)}"
 
-        if not vpc_response["Vpcs"]:
+        if not vpc:
             return False, f"VPC with ID {self.vpc_id} not found."
 
+        # Route tables are indexed before the subnets are streamed, so that
+        # every subnet is classified and validated in a single pass.
+        internet_route_tables: Set[str] = set()
+        subnet_route_tables: Dict[str, str] = {}
+        main_route_table_id = None
+        if self.internet_facing:
+            try:
+                internet_route_tables = {
+                    rt_id
+                    for rt_id, rt in self.topology.route_tables().items()
+                    if _has_valid_internet_route(rt)
+                }
+                subnet_route_tables = self.topology.subnet_route_tables()
+                main_route_table = self.topology.main_route_table()
+                if main_route_table:
+                    main_route_table_id = main_route_table["RouteTableId"]
+            except Exception as e:
+                return False, f"Error describing route tables: {str(e)}"
+
+        private_subnets = 0
+        public_subnets = 0
+        undersized_private = None
+        undersized_public = None
+        internet_accessible_subnets: List[str] = []
+        route_misconfigurations: List[str] = []
+
         try:
-            subnets_response = ec2_client.describe_subnets(
-                Filters=[{"Name": "vpc-id", "Values": [self.vpc_id]}]
-            )
+            for subnet in self.topology.iter_subnets():
+                subnet_id = subnet["SubnetId"]
+                undersized = int(subnet["CidrBlock"].split("/")[1]) > 24
+
+                if subnet["MapPublicIpOnLaunch"] is False:
+                    private_subnets += 1
+                    if undersized and not undersized_private:
+                        undersized_private = subnet
+                    continue
+
+                if subnet["MapPublicIpOnLaunch"] is not True:
+                    continue
+
+                public_subnets += 1
+                if undersized and not undersized_public:
+                    undersized_public = subnet
+                if not self.internet_facing:
+                    continue
+
+                route_table_id = subnet_route_tables.get(
+                    subnet_id, main_route_table_id
+                )
+                if route_table_id in internet_route_tables:
+                    if len(internet_accessible_subnets) < 2:
+                        internet_accessible_subnets.append(subnet_id)
+                elif len(route_misconfigurations) < MAX_REPORTED_ERRORS:
+                    route_misconfigurations.append(
+                        f"Subnet {subnet_id} has no associated route table."
+                        if not route_table_id else
+                        f"Subnet {subnet_id} does not have a valid IGW route."
+                    )
         except Exception as e:
             return False, f"Error describing subnets: {str(e)}"
 
-        subnets = subnets_response["Subnets"]
-
-        private_subnets = [
-            subnet for subnet in subnets if subnet[
-                "MapPublicIpOnLaunch"
-            ] is False
-        ]
-        public_subnets = [
-            subnet for subnet in subnets if subnet[
-                "MapPublicIpOnLaunch"
-            ] is True
-        ]
-
-        subnets_to_check = private_subnets
-
-        if len(private_subnets) < 2:
+        if private_subnets < 2:
             return False, (
                 "VPC must have at least 2 private subnets. "
-                f"Found: {len(private_subnets)}."
+                f"Found: {private_subnets}."
             )
 
-        if self.internet_facing:
-            if len(public_subnets) < 2:
-                return False, (
-                    "VPC must have at least 2 public subnets for "
-                    "internet-facing deployment. "
-                    f"Found: {len(public_subnets)}."
-                )
-            subnets_to_check += public_subnets
+        if self.internet_facing and public_subnets < 2:
+            return False, (
+                "VPC must have at least 2 public subnets for "
+                "internet-facing deployment. "
+                f"Found: {public_subnets}."
+            )
 
-        for subnet in subnets_to_check:
-            cidr_block = subnet["CidrBlock"]
-            cidr_block_range = int(cidr_block.split("/")[1])
-            if cidr_block_range > 24:
+        for subnet in [
+            undersized_private,
+            undersized_public if self.internet_facing else None,
+        ]:
+            if subnet:
                 return False, (
                     f"Subnet {subnet['SubnetId']} does not have at least "
-                    f"256 addresses in its CIDR - {cidr_block}."
+                    f"256 addresses in its CIDR - {subnet['CidrBlock']}."
                 )
 
         if not self.internet_facing:
             return True, (
                 "VPC has the required subnets. Private Subnets: "
-                f"{len(private_subnets)}."
+                f"{private_subnets}."
             )
 
-        try:
-            route_table_response = ec2_client.describe_route_tables(
-                Filters=[{"Name": "vpc-id", "Values": [self.vpc_id]}]
-            )
-        except Exception as e:
-            return False, f"Error describing route tables: {str(e)}"
-
-        route_tables = route_table_response.get("RouteTables", [])
-
-        subnet_route_table_map = {}
-        main_route_table = None
-
-        for rt in route_tables:
-            for assoc in rt.get("Associations", []):
-                if assoc.get("SubnetId"):
-                    subnet_route_table_map[assoc["SubnetId"]] = rt
-                elif assoc.get("Main"):
-                    main_route_table = rt
-
-        internet_accessible_subnets = []
-        route_misconfigurations = []
-
-        def _has_valid_internet_route(rt: dict) -> bool:
-            """Checks if a route table contains a valid default route."""
-            for route in rt.get("Routes", []):
-                if route.get("DestinationCidrBlock") == "0.0.0.0/0":
-                    if route.get("GatewayId", "").startswith("igw-"):
-                        return True
-            return False
-
-        for subnet in public_subnets:
-            subnet_id = subnet["SubnetId"]
-            route_table = subnet_route_table_map.get(
-                subnet_id, main_route_table
-            )
-
-            if not route_table:
-                route_misconfigurations.append(
-                    f"Subnet {subnet_id} has no associated route table."
-                )
-                continue
-
-            if _has_valid_internet_route(route_table):
-                internet_accessible_subnets.append(subnet_id)
-            else:
-                route_misconfigurations.append(
-                    f"Subnet {subnet_id} does not have a valid IGW route."
-                )
-
         if len(internet_accessible_subnets) < 2:
             return False, (
                 "Less than 2 public subnets have proper internet access. "
@@ -154,14 +154,27 @@ class ExistingVpcCheck(Prerequisite):
         return True, (
             "VPC has the required subnets and the correct internet "
             "access configurations. Private Subnets: "
-            f"{len(private_subnets)}, Public Subnets: {len(public_subnets)}"
+            f"{private_subnets}, Public Subnets: {public_subnets}"
         )
 
 
+def _has_valid_internet_route(rt: Dict) -> bool:
+    """
+    Checks if a route table contains a valid default route.
+    """
+    for route in rt.get("Routes", []):
+        if route.get("DestinationCidrBlock") == "0.0.0.0/0":
+            if route.get("GatewayId", "").startswith("igw-"):
+                return True
+    return False
+
+
 class DhcpOptionsCheck(Prerequisite):
     def __init__(
         self,
+        clients: Clients,
         vpc_id: str,
+        topology: VpcTopology,
     ) -> None:
         super().__init__(
             name="DHCP Options",
@@ -170,66 +183,65 @@ class DhcpOptionsCheck(Prerequisite):
                 "to resolve domain names using Amazon DNS."
             ),
             reference="tinyurl.com/yzxf4yv2",
+            clients=clients,
+            # The VPC is looked up in the session region.
+            region=topology.region,
         )
         self.vpc_id = vpc_id
+        self.topology = topology
+
+    def providers(self) -> List[Provider]:
+        return [(self.topology.dhcp_options,)]
+
+    def fingerprint(self) -> Hashable:
+        """
+        Changes with the DHCP options set associated with the VPC.
+        """
+        vpc = self.topology.vpc()
+        return self.vpc_id, vpc and vpc["DhcpOptionsId"]
 
     def check(self) -> Tuple[bool, str]:
         """
         Checks if the DHCP options set is correctly configured.
         """
-        ec2_client = boto3.client("ec2")
-
         try:
-            vpcs = ec2_client.describe_vpcs()["Vpcs"]
+            vpc = self.topology.vpc()
         except Exception as e:
             return False, f"Error describing VPCs: {str(e)}"
 
-        existing_vpc = self.vpc_id
-
-        if existing_vpc:
-            vpc = next(
-                (vpc for vpc in vpcs if vpc.get("VpcId") == existing_vpc), None
-            )
-            if not vpc:
+        if not vpc:
+            if self.vpc_id:
                 return False, (
                     "Specified VPC not found in this account."
                 )
-        else:
-            vpc = next((vpc for vpc in vpcs if vpc.get("IsDefault")), None)
-            if not vpc:
-                return False, (
-                    "Test skipped due to not found a default "
-                    "VPC for this account"
-                )
+            return False, (
+                "Test skipped due to not found a default "
+                "VPC for this account"
+            )
 
         dhcp_option_id = vpc["DhcpOptionsId"]
 
         try:
-            dhcp_options = ec2_client.describe_dhcp_options(
-                DhcpOptionsIds=[dhcp_option_id]
-            )["DhcpOptions"]
+            dhcp_options = self.topology.dhcp_options()
         except Exception as e:
             return False, f"Error describing DHCP options: {str(e)}"
 
-        for option in dhcp_options:
-            for config in option["DhcpConfigurations"]:
-                if config["Key"] == "domain-name-servers":
-                    dns_servers = [
-                        value["Value"] for value in config["Values"]
-                    ]
-
-                    if ("AmazonProvidedDNS" in dns_servers or
-                            "169.254.169.253" in dns_servers):
-                        return True, (
-                            f"Default DHCP option set ({dhcp_option_id}) is "
-                            "correctly configured"
-                        )
-                    else:
-                        return False, (
-                            f"Default DHCP option set ({dhcp_option_id}) is "
-                            "missing 'AmazonProvidedDNS'. "
-                            f"Found: {dns_servers}"
-                        )
+        for config in (dhcp_options or {}).get("DhcpConfigurations", []):
+            if config["Key"] == "domain-name-servers":
+                dns_servers = [value["Value"] for value in config["Values"]]
+
+                if ("AmazonProvidedDNS" in dns_servers or
+                        "169.254.169.253" in dns_servers):
+                    return True, (
+                        f"Default DHCP option set ({dhcp_option_id}) is "
+                        "correctly configured"
+                    )
+                else:
+                    return False, (
+                        f"Default DHCP option set ({dhcp_option_id}) is "
+                        "missing 'AmazonProvidedDNS'. "
+                        f"Found: {dns_servers}"
+                    )
 
         return False, (
             "No 'domain-name-servers' configuration found "
@@ -1,11 +1,12 @@
-from typing import Tuple
-
-import boto3
+from typing import Hashable, List, Tuple
 
+from co_support.prerequisites.core.clients import Clients
+from co_support.prerequisites.core.inventory import Ec2Inventory
 from co_support.prerequisites.core.prerequisite import (
-    SKIP_PREREQ,
     Prerequisite,
+    Provider,
 )
+from co_support.prerequisites.core.quotas import ServiceQuotas
 
 
 class VcpuQuotaCheck(Prerequisite):
@@ -14,7 +15,10 @@ class VcpuQuotaCheck(Prerequisite):
         name: str,
         description: str,
         reference: str,
+        clients: Clients,
         region: str,
+        inventory: Ec2Inventory,
+        quotas: ServiceQuotas,
         required_vcpus: int,
         quota_code: str,
         service_code: str = "ec2",
@@ -23,57 +27,42 @@ class VcpuQuotaCheck(Prerequisite):
             name=name,
             description=description,
             reference=reference,
+            clients=clients,
+            region=region,
         )
-        self.region = region
+        self.inventory = inventory
+        self.quotas = quotas
         self.required_vcpus = required_vcpus
         self.quota_code = quota_code
         self.service_code = service_code
 
+    def providers(self) -> List[Provider]:
+        return [
+            (self.inventory.quota_usage,),
+            (self.quotas.service_quotas, self.service_code),
+        ]
+
+    def fingerprint(self) -> Hashable:
+        """
+        Changes with the quota value; the instance scan is left to the TTL.
+        """
+        return self.quotas.value(self.service_code, self.quota_code)
+
     def check(self) -> Tuple[bool, str]:
         """
         Checks if the required vCPUs are available within the quota limits.
         """
-        service_quotas = boto3.client(
-            "service-quotas",
-            region_name=self.region
-        )
-        ec2_client = boto3.client("ec2", region_name=self.region)
-
         try:
-            quota_response = service_quotas.get_service_quota(
-                ServiceCode=self.service_code,
-                QuotaCode=self.quota_code,
-            )
-            vcpu_limit = int(quota_response["Quota"]["Value"])
-
-        except service_quotas.exceptions.NoSuchResourceException:
-            return False, "Quota not found."
+            vcpu_limit = self.quotas.value(self.service_code, self.quota_code)
         except Exception as e:
             return False, f"Error fetching vCPU quota: {str(e)}"
 
-        try:
-            used_vcpus = 0
-            paginator = ec2_client.get_paginator("describe_instances")
-            page_iterator = paginator.paginate(
-                Filters=[
-                    {
-                        "Name": "instance-state-name",
-                        "Values": ["pending", "running"],
-                    }
-                ]
-            )
-
-            for page in page_iterator:
-                for reservation in page["Reservations"]:
-                    for instance in reservation["Instances"]:
-                        instance_type = instance["InstanceType"]
-                        type_info = ec2_client.describe_instance_types(
-                            InstanceTypes=[instance_type]
-                        )
-                        vcpu_info = type_info["InstanceTypes"][0]["VCpuInfo"]
-                        vcpu_count = vcpu_info["DefaultVCpus"]
-                        used_vcpus += vcpu_count
+        if vcpu_limit is None:
+            return False, "Quota not found."
+        vcpu_limit = int(vcpu_limit)
 
+        try:
+            used_vcpus = self.inventory.quota_usage()[self.quota_code]
             available_vcpus = vcpu_limit - used_vcpus
 
             if available_vcpus >= self.required_vcpus:
@@ -95,7 +84,10 @@ class VcpuQuotaCheck(Prerequisite):
 class OnDemandStandardVcpuQuotaCheck(VcpuQuotaCheck):
     def __init__(
         self,
+        clients: Clients,
         region: str,
+        inventory: Ec2Inventory,
+        quotas: ServiceQuotas,
     ) -> None:
         super().__init__(
             name="On-Demand Standard Instances",
@@ -104,7 +96,10 @@ class OnDemandStandardVcpuQuotaCheck(VcpuQuotaCheck):
                 "instances is sufficient."
             ),
             reference="tinyurl.com/mwz5s3th",
+            clients=clients,
             region=region,
+            inventory=inventory,
+            quotas=quotas,
             required_vcpus=34,
             quota_code="L-1216C47A",
         )
@@ -113,7 +108,10 @@ class OnDemandStandardVcpuQuotaCheck(VcpuQuotaCheck):
 class OnDemandGandVTInstancesQuotaCheck(VcpuQuotaCheck):
     def __init__(
         self,
+        clients: Clients,
         region: str,
+        inventory: Ec2Inventory,
+        quotas: ServiceQuotas,
     ) -> None:
         super().__init__(
             name="On-Demand G and VT Instances",
@@ -122,16 +120,23 @@ class OnDemandGandVTInstancesQuotaCheck(VcpuQuotaCheck):
                 "instances is sufficient."
             ),
             reference="tinyurl.com/3c2pvau2",
+            clients=clients,
             region=region,
+            inventory=inventory,
+            quotas=quotas,
             required_vcpus=32,
             quota_code="L-DB2E81BA",
         )
 
 
 class AvailableEipCheck(Prerequisite):
+    inputs = ("internet_facing",)
+
     def __init__(
         self,
+        clients: Clients,
         region: str,
+        quotas: ServiceQuotas,
         internet_facing: bool
     ) -> None:
         super().__init__(
@@ -140,31 +145,41 @@ class AvailableEipCheck(Prerequisite):
                 "Checks if the addresses quota for Elastic IPs is sufficient."
             ),
             reference="tinyurl.com/2878e6at",
+            clients=clients,
+            region=region,
         )
-        self.region = region
+        self.quotas = quotas
         self.internet_facing = internet_facing
         self.required_eips = 2
 
+    def providers(self) -> List[Provider]:
+        return [(self.quotas.service_quotas, "ec2")]
+
+    def fingerprint(self) -> Hashable:
+        """
+        Changes with the quota value and the number of allocated EIPs.
+        """
+        ec2_client = self.clients.client("ec2", self.region)
+        return (
+            len(ec2_client.describe_addresses().get("Addresses", [])),
+            self.quotas.value("ec2", "L-0263D0A3"),
+        )
+
     def check(self) -> Tuple[bool, str]:
         """
         Checks if the required Elastic IPs (EIPs) are available
         within the quota limits.
         """
-        if not self.internet_facing:
-            return SKIP_PREREQ
-
-        ec2_client = boto3.client("ec2", region_name=self.region)
-        sq_client = boto3.client("service-quotas", region_name=self.region)
+        ec2_client = self.clients.client("ec2", self.region)
 
         try:
             eips_response = ec2_client.describe_addresses()
             addresses = eips_response.get("Addresses", [])
             total_allocated = len(addresses)
-            quota_response = sq_client.get_service_quota(
-                ServiceCode="ec2",
-                QuotaCode="L-0263D0A3",
-            )
-            quota_limit = int(quota_response["Quota"]["Value"])
+            quota_limit = self.quotas.value("ec2", "L-0263D0A3")
+            if quota_limit is None:
+                return False, "Quota not found."
+            quota_limit = int(quota_limit)
             remaining_quota = quota_limit - total_allocated
 
             if remaining_quota < self.required_eips:
@@ -186,7 +201,9 @@ class AvailableEipCheck(Prerequisite):
 class AvailableCEsCheck(Prerequisite):
     def __init__(
         self,
+        clients: Clients,
         region: str,
+        quotas: ServiceQuotas,
     ) -> None:
         super().__init__(
             name="Available Compute Environments",
@@ -195,25 +212,27 @@ class AvailableCEsCheck(Prerequisite):
                 "is sufficient."
             ),
             reference="tinyurl.com/3hbyk5m5",
+            clients=clients,
+            region=region,
         )
-        self.region = region
+        self.quotas = quotas
         self.required_ces = 5
 
+    def providers(self) -> List[Provider]:
+        return [(self.quotas.service_quotas, "batch")]
+
     def check(self) -> Tuple[bool, str]:
         """
         Checks if the required Compute Environments (CEs) are available
         within the quota limits.
         """
-        sq_client = boto3.client("service-quotas", region_name=self.region)
-
         try:
-            quota_response = sq_client.get_service_quota(
-                ServiceCode="batch",
-                QuotaCode="L-144F0CA5",
-            )
-            quota_limit = int(quota_response["Quota"]["Value"])
+            quota_limit = self.quotas.value("batch", "L-144F0CA5")
+            if quota_limit is None:
+                return False, "Quota not found."
+            quota_limit = int(quota_limit)
 
-            client = boto3.client('batch', region_name=self.region)
+            client = self.clients.client("batch", self.region)
             total_ces = len(
                 client.describe_compute_environments().get(
                     "computeEnvironments"
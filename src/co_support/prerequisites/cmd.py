@@ -1,4 +1,10 @@
-from argparse import _SubParsersAction, BooleanOptionalAction
+from argparse import (
+    _SubParsersAction,
+    ArgumentParser,
+    ArgumentTypeError,
+    BooleanOptionalAction,
+)
+from typing import Callable, List, Optional
 
 from co_support.prerequisites.core.questions import (
     Questions,
@@ -6,16 +12,129 @@ from co_support.prerequisites.core.questions import (
     YesNoQuestion,
 )
 from co_support.prerequisites.core.answers import Answers
-from co_support.prerequisites.core.checks import check_prerequisites
-from co_support.prerequisites.core.environment import Environment
 from co_support.cmd import BaseCommand
 
 
+def positive_int(value: str) -> int:
+    """
+    Parses a strictly positive integer command-line value.
+    """
+    try:
+        number = int(value)
+    except ValueError:
+        raise ArgumentTypeError(f"{value} is not an integer")
+    if number < 1:
+        raise ArgumentTypeError(f"{value} must be at least 1")
+    return number
+
+
+def positive_float(value: str) -> float:
+    """
+    Parses a strictly positive number command-line value.
+    """
+    try:
+        number = float(value)
+    except ValueError:
+        raise ArgumentTypeError(f"{value} is not a number")
+    if number <= 0:
+        raise ArgumentTypeError(f"{value} must be greater than 0")
+    return number
+
+
+def comma_list(
+    keyword: Optional[str] = None,
+) -> Callable[[str], List[str]]:
+    """
+    Returns a parser of comma-separated command-line values, which also
+    accepts an optional keyword on its own (e.g., "all").
+    """
+    def parse(value: str) -> List[str]:
+        items = [item.strip() for item in value.split(",") if item.strip()]
+        if not items:
+            raise ArgumentTypeError("at least one value is required")
+        if keyword in items and len(items) > 1:
+            raise ArgumentTypeError(
+                f"'{keyword}' cannot be combined with other values"
+            )
+        return list(dict.fromkeys(items))
+
+    return parse
+
+
+def create_clients(args, concurrency: Optional[int] = None) -> None:
+    """
+    Creates the clients, environment and DNS verifier shared by the checks
+    of a process, sized for the given number of concurrent API calls.
+    """
+    from co_support.prerequisites.core.clients import Clients
+    from co_support.prerequisites.core.delegation import DelegationVerifier
+    from co_support.prerequisites.core.environment import Environment
+    from co_support.prerequisites.core.profile import Profiler
+
+    # The profiler also counts the API calls of each check for the
+    # results, so it is created even without --profile.
+    args.profiler = Profiler()
+    args.clients = Clients(
+        concurrency=concurrency or args.jobs,
+        profiler=args.profiler,
+    )
+    args.env = Environment(args.clients)
+    args.delegation = DelegationVerifier(
+        args.dns_resolvers,
+        args.dns_timeout,
+    )
+
+
+def add_run_arguments(parser: ArgumentParser) -> None:
+    """
+    Adds the arguments shared by every run of the checks of a process.
+    """
+    parser.add_argument(
+        "-j", "--jobs",
+        help="Maximum number of prerequisite checks to run concurrently",
+        type=positive_int,
+        default=8,
+    )
+    parser.add_argument(
+        "--account-role",
+        help=(
+            "Name of the role to assume in the accounts given by ID"
+        ),
+        default="OrganizationAccountAccessRole",
+    )
+    parser.add_argument(
+        "--offline",
+        help=(
+            "Use the locally cached Code Ocean template instead of "
+            "downloading it"
+        ),
+        action=BooleanOptionalAction,
+        default=False,
+    )
+    parser.add_argument(
+        "--dns-resolvers",
+        help=(
+            "Comma-separated list of DNS resolvers used to verify the "
+            "delegation of the hosted zone, as host or host:port "
+            "(default: the system resolvers)"
+        ),
+        type=comma_list(),
+        default=None,
+    )
+    parser.add_argument(
+        "--dns-timeout",
+        help="Deadline of each DNS query in seconds",
+        type=positive_float,
+        default=2.0,
+    )
+
+
 def commands(subparsers: _SubParsersAction) -> None:
     """
     Registers all commands for the prerequisites module.
     """
     CheckPrerequisites(subparsers)
+    Serve(subparsers)
 
 
 class CheckPrerequisites(BaseCommand):
@@ -33,15 +152,72 @@ class CheckPrerequisites(BaseCommand):
         )
         self.parser.add_argument(
             "-f", "--format",
-            choices=["table", "yaml"],
+            choices=["table", "yaml", "json", "ndjson"],
             default="table",
-            help="Output format: table or yaml",
+            help="Output format: table, yaml, json or ndjson",
+        )
+        self.parser.add_argument(
+            "--stream",
+            help=(
+                "Print each table row as soon as its check completes; "
+                "ndjson output is always streamed"
+            ),
+            action=BooleanOptionalAction,
+            default=False,
+        )
+        self.parser.add_argument(
+            "--watch",
+            help=(
+                "Run the checks again every WATCH seconds until interrupted, "
+                "evaluating only the checks whose inputs changed or whose "
+                "result expired, and print the status changes"
+            ),
+            type=positive_float,
+            default=None,
+        )
+        self.parser.add_argument(
+            "--watch-ttl",
+            help=(
+                "Number of seconds a passed result is kept in watch mode "
+                "before its check is evaluated again"
+            ),
+            type=positive_float,
+            default=300.0,
         )
         self.parser.add_argument(
             "-o", "--output",
             help="Path to the directory where the output file will be saved",
             default=None,
         )
+        add_run_arguments(self.parser)
+        self.parser.add_argument(
+            "--profile",
+            help=(
+                "Print the time spent per check and per AWS operation"
+            ),
+            action=BooleanOptionalAction,
+            default=False,
+        )
+        self.parser.add_argument(
+            "--regions",
+            help=(
+                "Comma-separated list of regions to run the region-scoped "
+                "checks in, or 'all' for every enabled region "
+                "(e.g., us-east-1,eu-west-1)"
+            ),
+            type=comma_list("all"),
+            default=None,
+        )
+        self.parser.add_argument(
+            "--accounts",
+            help=(
+                "Comma-separated list of account IDs or role ARNs to run "
+                "the checks in, or 'organization' for every active account "
+                "of the AWS Organization"
+            ),
+            type=comma_list("organization"),
+            default=None,
+        )
         self.parser.add_argument(
             "--version",
             help="Version of Code Ocean to deploy (e.g., v3.4.1)",
@@ -66,6 +242,7 @@ class CheckPrerequisites(BaseCommand):
             help=(
                 "ARN of the SSL/TLS certificate "
                 "(e.g., arn:aws:acm:region:account:certificate/certificate-id)"
+                ", or 'discover' to use the best ACM certificate of the domain"
             ),
         )
         self.parser.add_argument(
@@ -89,7 +266,30 @@ class CheckPrerequisites(BaseCommand):
         """
         Executes the 'check-prerequisites' command.
         """
-        args.env = Environment()
+        if args.watch:
+            ignored = [
+                flag
+                for flag, value in [
+                    ("-o/--output", args.output),
+                    ("--stream", args.stream),
+                    ("--profile", args.profile),
+                    # A JSON document only ends with the run; watch mode
+                    # streams its records with -f ndjson instead.
+                    ("-f json", args.format == "json"),
+                ]
+                if value
+            ]
+            if ignored:
+                self.parser.error(
+                    f"--watch cannot be combined with {', '.join(ignored)}"
+                )
+
+        # boto3 and the checks are imported here rather than at module level
+        # so that argument parsing and --help do not pay for loading them.
+        from co_support.prerequisites.core.checks import check_prerequisites
+        from co_support.prerequisites.core.watch import watch_prerequisites
+
+        create_clients(args)
         questions = Questions(
             [
                 Question(
@@ -143,6 +343,7 @@ class CheckPrerequisites(BaseCommand):
                                 ),
                                 Question(
                                     text="Please provide the certificate ARN:",
+                                    comment="or 'discover' to search ACM for the certificates of the domain", # noqa
                                     property="cert",
                                     args=args,
                                 ),
@@ -172,4 +373,62 @@ class CheckPrerequisites(BaseCommand):
 
         questions.ask()
         answers = Answers(questions.answers(), args)
-        check_prerequisites(answers, args)
+        if args.watch:
+            watch_prerequisites(answers, args)
+        else:
+            check_prerequisites(answers, args)
+
+
+class Serve(BaseCommand):
+    """
+    Command to serve prerequisite checks over a local HTTP API.
+    """
+
+    def __init__(self, subparsers: _SubParsersAction) -> None:
+        super().__init__(subparsers, "serve")
+        self.parser.add_argument(
+            "--host",
+            help="Address to listen on",
+            default="127.0.0.1",
+        )
+        self.parser.add_argument(
+            "--port",
+            help="Port to listen on",
+            type=int,
+            default=8080,
+        )
+        self.parser.add_argument(
+            "--max-runs",
+            help=(
+                "Maximum number of check requests to run in parallel; "
+                "further requests are rejected with 429"
+            ),
+            type=positive_int,
+            default=4,
+        )
+        add_run_arguments(self.parser)
+
+    def cmd(self, args) -> None:
+        """
+        Executes the 'serve' command.
+        """
+        from co_support.prerequisites.core.server import CheckServer
+
+        # The runs in parallel share the connection pools of the clients.
+        create_clients(args, args.jobs * args.max_runs)
+        server = CheckServer(
+            args,
+            parsers={
+                "regions": comma_list("all"),
+                "accounts": comma_list("organization"),
+            },
+            max_runs=args.max_runs,
+        )
+        host, port = server.address
+        print(f"Serving prerequisite checks on http://{host}:{port}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.shutdown()
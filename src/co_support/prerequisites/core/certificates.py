@@ -0,0 +1,178 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from cryptography import x509
+from cryptography.x509.oid import ExtensionOID
+
+from co_support.prerequisites.core.clients import Clients
+from co_support.prerequisites.core.profile import in_context
+
+# Key types of the certificates listed by discovery; ACM only lists
+# RSA_2048 certificates by default.
+KEY_TYPES = [
+    "RSA_1024",
+    "RSA_2048",
+    "RSA_3072",
+    "RSA_4096",
+    "EC_prime256v1",
+    "EC_secp384r1",
+    "EC_secp521r1",
+]
+
+
+def required_names(domain: str) -> List[str]:
+    """
+    Returns the names a certificate of the hosting domain must cover.
+    """
+    return [domain, f"*.{domain}"]
+
+
+def coverage(sans: List[str], domain: str) -> int:
+    """
+    Returns the number of required names of the domain listed in the
+    subject alternative names of a certificate.
+    """
+    sans = {san.lower() for san in sans}
+    return sum(name.lower() in sans for name in required_names(domain))
+
+
+def discover_certificates(clients: Clients, domain: str) -> List[Dict]:
+    """
+    Returns the details of the issued ACM certificates covering the
+    hosting domain, best first: by coverage of the domain and *.domain,
+    then by expiry.
+    """
+    acm = clients.client("acm")
+    paginator = acm.get_paginator("list_certificates")
+    candidates = [
+        summary["CertificateArn"]
+        for page in paginator.paginate(
+            CertificateStatuses=["ISSUED"],
+            Includes={"keyTypes": KEY_TYPES},
+        )
+        for summary in page["CertificateSummaryList"]
+        if summary.get("HasAdditionalSubjectAlternativeNames")
+        or coverage(
+            summary.get("SubjectAlternativeNameSummaries")
+            or [summary.get("DomainName", "")],
+            domain,
+        )
+    ]
+    if not candidates:
+        return []
+
+    with ThreadPoolExecutor(
+        max_workers=min(len(candidates), max(1, clients.concurrency)),
+    ) as executor:
+        details = list(executor.map(
+            in_context(
+                lambda arn: acm.describe_certificate(
+                    CertificateArn=arn
+                )["Certificate"]
+            ),
+            candidates,
+        ))
+
+    covering = [
+        (coverage(cert.get("SubjectAlternativeNames", []), domain), cert)
+        for cert in details
+    ]
+    covering = [(score, cert) for score, cert in covering if score]
+    covering.sort(
+        key=lambda item: (
+            item[0],
+            item[1].get("NotAfter") or datetime.min.replace(
+                tzinfo=timezone.utc
+            ),
+        ),
+        reverse=True,
+    )
+    return [cert for _, cert in covering]
+
+
+def verify_chain(
+    cert_pem: str,
+    chain_pem: str,
+    partial_chain: bool,
+    at: Optional[datetime] = None,
+) -> None:
+    """
+    Verifies a PEM certificate against the PEM certificates of its chain,
+    in the same way as openssl verify -CAfile chain. With partial_chain,
+    any certificate of the chain is a trust anchor; otherwise the chain
+    must lead up to a self-signed root. Raises ValueError when the
+    certificate cannot be verified.
+    """
+    at = at or datetime.now(timezone.utc)
+    cert = x509.load_pem_x509_certificate(cert_pem.encode())
+    chain = x509.load_pem_x509_certificates(chain_pem.encode())
+
+    _check_validity(cert, at)
+    current = cert
+    # Each certificate of the chain is used at most once.
+    for _ in range(len(chain)):
+        if partial_chain and current in chain:
+            return
+        issuer = _find_issuer(current, chain)
+        if not issuer:
+            raise ValueError(
+                "unable to get issuer certificate of "
+                f"{current.subject.rfc4514_string()}"
+            )
+        _check_validity(issuer, at)
+        _check_ca(issuer)
+        if partial_chain or _is_self_signed(issuer):
+            return
+        current = issuer
+
+    raise ValueError(
+        "unable to get local issuer certificate of "
+        f"{current.subject.rfc4514_string()}"
+    )
+
+
+def _find_issuer(
+    cert: x509.Certificate,
+    chain: List[x509.Certificate],
+) -> Optional[x509.Certificate]:
+    for candidate in chain:
+        if candidate == cert or candidate.subject != cert.issuer:
+            continue
+        try:
+            cert.verify_directly_issued_by(candidate)
+        except Exception:
+            continue
+        return candidate
+    return None
+
+
+def _is_self_signed(cert: x509.Certificate) -> bool:
+    if cert.subject != cert.issuer:
+        return False
+    try:
+        cert.verify_directly_issued_by(cert)
+    except Exception:
+        return False
+    return True
+
+
+def _check_validity(cert: x509.Certificate, at: datetime) -> None:
+    subject = cert.subject.rfc4514_string()
+    if at < cert.not_valid_before_utc:
+        raise ValueError(f"certificate {subject} is not yet valid")
+    if at > cert.not_valid_after_utc:
+        raise ValueError(f"certificate {subject} has expired")
+
+
+def _check_ca(cert: x509.Certificate) -> None:
+    try:
+        constraints = cert.extensions.get_extension_for_oid(
+            ExtensionOID.BASIC_CONSTRAINTS
+        ).value
+    except x509.ExtensionNotFound:
+        return
+    if not constraints.ca:
+        raise ValueError(
+            f"certificate {cert.subject.rfc4514_string()} is not a CA"
+        )
@@ -1,11 +1,34 @@
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from co_support.prerequisites.core.environment import Environment
+from co_support.prerequisites.core.inventory import (
+    Ec2Inventory,
+    InstanceTypes,
+)
 from co_support.prerequisites.core.prerequisite import (
-    SKIP_PREREQ
+    SKIP_PREREQ,
+    Prerequisite,
 )
 from co_support.prerequisites.core.render import (
+    TableStream,
+    print_profile,
     print_summary,
     print_yaml,
     print_table,
+    result_row,
+)
+from co_support.prerequisites.core.result import (
+    CheckResult,
+    to_json,
+    to_ndjson,
 )
+from co_support.prerequisites.core.quotas import ServiceQuotas
+from co_support.prerequisites.core.scheduler import Outcome, run_checks
+from co_support.prerequisites.core.templates import TemplateCache
+from co_support.prerequisites.core.topology import VpcTopology
 from co_support.prerequisites.checks import (
     access,
     network,
@@ -14,76 +37,344 @@ from co_support.prerequisites.checks import (
 )
 
 
-def check_prerequisites(answers, args):
-    prerequisites = [
+def build_prerequisites(
+    answers,
+    args,
+    env: Environment,
+    regions: List[str],
+    templates: Optional[TemplateCache] = None,
+) -> List[Prerequisite]:
+    """
+    Builds the prerequisite checks of an account in their declared order,
+    repeating the region-scoped ones for each of the given regions.
+    """
+    clients = env.clients
+    templates = templates or TemplateCache(offline=args.offline)
+    inventories = {
+        region: Ec2Inventory(
+            clients,
+            region,
+            InstanceTypes(clients, region),
+        )
+        for region in regions
+    }
+    quotas = {region: ServiceQuotas(clients, region) for region in regions}
+    topology = VpcTopology(clients, env.region, answers.retrieve("vpc"))
+
+    return [
         access.AdminAccessCheck(
-            role_arn=answers.retrieve("role"),
+            clients=clients,
+            role_arn=deploy_role(answers, args, env),
         ),
-        access.SharedAmiCheck(
-            version=answers.retrieve("version"),
-            region=args.env.region,
-            account=args.env.account,
+        *(
+            access.SharedAmiCheck(
+                clients=clients,
+                version=answers.retrieve("version"),
+                region=region,
+                account=env.account,
+                templates=templates,
+            )
+            for region in regions
+        ),
+        access.LinkedRolesCheck(
+            clients=clients,
         ),
-        access.LinkedRolesCheck(),
         network.DhcpOptionsCheck(
+            clients=clients,
             vpc_id=answers.retrieve("vpc"),
+            topology=topology,
         ),
         network.ExistingVpcCheck(
+            clients=clients,
             vpc_id=answers.retrieve("vpc"),
             internet_facing=answers.retrieve("internet_facing"),
+            topology=topology,
         ),
-        quota.OnDemandStandardVcpuQuotaCheck(
-            region=args.env.region,
+        *(
+            quota.OnDemandStandardVcpuQuotaCheck(
+                clients=clients,
+                region=region,
+                inventory=inventories[region],
+                quotas=quotas[region],
+            )
+            for region in regions
         ),
-        quota.OnDemandGandVTInstancesQuotaCheck(
-            region=args.env.region,
+        *(
+            quota.OnDemandGandVTInstancesQuotaCheck(
+                clients=clients,
+                region=region,
+                inventory=inventories[region],
+                quotas=quotas[region],
+            )
+            for region in regions
         ),
-        quota.AvailableEipCheck(
-            region=args.env.region,
-            internet_facing=answers.retrieve("internet_facing"),
+        *(
+            quota.AvailableEipCheck(
+                clients=clients,
+                region=region,
+                quotas=quotas[region],
+                internet_facing=answers.retrieve("internet_facing"),
+            )
+            for region in regions
         ),
-        quota.AvailableCEsCheck(
-            region=args.env.region,
+        *(
+            quota.AvailableCEsCheck(
+                clients=clients,
+                region=region,
+                quotas=quotas[region],
+            )
+            for region in regions
         ),
         domain.HostedZoneCheck(
+            clients=clients,
             hosting_domain=answers.retrieve("domain"),
             hosted_zone_id=answers.retrieve("zone"),
             internet_facing=answers.retrieve("internet_facing"),
+            delegation=args.delegation,
         ),
         domain.CertificateCheck(
+            clients=clients,
             cert_arn=answers.retrieve("cert"),
             hosting_domain=answers.retrieve("domain"),
             private_ca=answers.retrieve("private_ca"),
         ),
     ]
 
-    print("Starting prerequisite checks...")
-    total_failed = 0
-    titles = ["Status", "Name", "Description", "Result", "Reference"]
-    data = []
 
-    for p in prerequisites:
-        passed, result = p.check()
-        if (passed, result) == SKIP_PREREQ:
-            continue
+def assume_accounts(args) -> Tuple[List[Environment], Dict[str, str]]:
+    """
+    Assumes the deployment role in each requested account concurrently.
+    Returns the environments of the roles that could be assumed and the
+    error of each role that could not, keyed by role ARN.
+    """
+    accounts = args.accounts
+    if accounts == ["organization"]:
+        accounts = args.env.organization_accounts()
+    role_arns = [
+        args.env.role_arn(account, args.account_role) for account in accounts
+    ]
+
+    def assume(role_arn: str) -> Tuple[Optional[Environment], str]:
+        try:
+            return args.env.assume_role(role_arn), ""
+        except Exception as e:
+            return None, f"Error assuming role {role_arn}: {str(e)}"
+
+    environments, errors = [], {}
+    with ThreadPoolExecutor(max_workers=args.jobs) as executor:
+        for role_arn, (env, error) in zip(
+            role_arns, executor.map(assume, role_arns)
+        ):
+            if env:
+                environments.append(env)
+            else:
+                errors[role_arn] = error
+
+    return environments, errors
+
+
+def deploy_role(answers, args, env: Environment) -> str:
+    """
+    Returns the ARN of the role deploying the template in an account. The
+    answered role, or else the current identity, deploys it in the account
+    of the session; the role assumed in an account of --accounts deploys
+    it there, since the answered role belongs to another account.
+    """
+    if env is args.env:
+        return answers.retrieve("role") or env.role
+    return env.role
+
+
+def resolve_environments(
+    args,
+) -> Tuple[List[Environment], List[str], Dict[str, str]]:
+    """
+    Returns the environments of the requested accounts and the requested
+    regions, along with the error of each role that could not be assumed,
+    keyed by role ARN.
+    """
+    environments, errors = [args.env], {}
+    if args.accounts:
+        environments, errors = assume_accounts(args)
+
+    regions = args.regions or [args.env.region]
+    if regions == ["all"]:
+        regions = args.env.enabled_regions()
+
+    return environments, regions, errors
+
+
+def build_targets(
+    answers,
+    args,
+    environments: List[Environment],
+    regions: List[str],
+    templates: Optional[TemplateCache] = None,
+) -> List[Tuple[Environment, Prerequisite]]:
+    """
+    Builds the checks of every environment and region.
+    """
+    return [
+        (env, p)
+        for env in environments
+        for p in build_prerequisites(answers, args, env, regions, templates)
+    ]
+
+
+def resolve_targets(
+    answers,
+    args,
+    templates: Optional[TemplateCache] = None,
+) -> Tuple[List[Tuple[Environment, Prerequisite]], Dict[str, str]]:
+    """
+    Builds the checks of every requested account and region, along with
+    the error of each role that could not be assumed, keyed by role ARN.
+    """
+    environments, regions, errors = resolve_environments(args)
+    targets = build_targets(answers, args, environments, regions, templates)
+    return targets, errors
+
+
+def check_result(
+    env: Environment,
+    p: Prerequisite,
+    outcome: Outcome,
+) -> Optional[CheckResult]:
+    """
+    Returns the result of a check, or None when it was skipped.
+    """
+    (passed, message), timing = outcome
+    if (passed, message) == SKIP_PREREQ:
+        return None
+
+    return CheckResult(
+        status="passed" if passed else "failed",
+        check=p.id,
+        name=p.name,
+        account=env.account,
+        region=p.region,
+        duration=round(timing.duration, 3),
+        api_calls=timing.api_calls,
+        detail={"message": message},
+        description=p.description,
+        reference=p.reference,
+        started=timing.started.isoformat(),
+        ended=timing.ended.isoformat(),
+    )
+
+
+def account_access_result(role_arn: str, error: str) -> CheckResult:
+    """
+    Returns the failed result of a role that could not be assumed.
+    """
+    return CheckResult(
+        status="failed",
+        check="account-access",
+        name="Account Access",
+        account=role_arn.split(":")[4],
+        region="",
+        duration=0.0,
+        api_calls=0,
+        detail={"message": error},
+        description=(
+            "Checks if the deployment role can be assumed in the account."
+        ),
+    )
+
+
+def check_prerequisites(answers, args):
+    targets, errors = resolve_targets(answers, args)
+
+    # JSON is written to stdout, and everything else to stderr.
+    console = sys.stderr if args.format in ["json", "ndjson"] else sys.stdout
+    print("Starting prerequisite checks...", file=console)
+    titles = [
+        "Status",
+        "Name",
+        "Description",
+        "Result",
+        "Reference",
+        "Started",
+        "Ended",
+        "Duration",
+    ]
+    if args.regions:
+        titles.insert(2, "Region")
+    if args.accounts:
+        titles.insert(2, "Account")
+    fields = [t for t in titles if t not in ["Started", "Ended"]]
+
+    stream = None
+    if args.format == "ndjson":
+        stream = to_ndjson
+    elif args.stream and args.format == "table":
+        table_stream = TableStream(titles, fields)
+        print(table_stream.header(), flush=True)
+        stream = table_stream.row
+
+    results: List[CheckResult] = []
+    for role_arn, error in errors.items():
+        result = account_access_result(role_arn, error)
+        results.append(result)
+        if stream:
+            print(stream(result), flush=True)
 
-        data.append([passed, p.name, p.description, result, p.reference])
-        if not passed:
-            total_failed += 1
+    check_results: List[Optional[CheckResult]] = [None] * len(targets)
+
+    def on_outcome(i: int, outcome: Outcome) -> None:
+        check_results[i] = check_result(*targets[i], outcome)
+        if stream and check_results[i]:
+            print(stream(check_results[i]), flush=True)
+
+    started = time.perf_counter()
+    outcomes = run_checks([p for _, p in targets], args.jobs, on_outcome)
+    total_duration = time.perf_counter() - started
+
+    results += [result for result in check_results if result]
+    total_failed = sum(1 for result in results if not result.passed)
 
     if args.format == "table":
-        results = print_table(titles, data)
+        output = print_table(
+            titles,
+            [result_row(titles, result) for result in results],
+            fields=fields,
+        )
     elif args.format == "yaml":
-        results = print_yaml(titles, data)
+        output = print_yaml(
+            titles,
+            [result_row(titles, result) for result in results],
+        )
+    elif args.format == "json":
+        output = to_json(results)
+    elif args.format == "ndjson":
+        output = "\n".join(to_ndjson(result) for result in results)
     else:
         raise ValueError(f"Unsupported format: {args.format}")
 
     if args.output:
         path = f"{args.output}/results.{args.format}"
         with open(path, "w") as f:
-            f.write(str(results))
-        print(f"Results have been written to {path}.")
-    else:
-        print(results)
+            f.write(str(output))
+        print(f"Results have been written to {path}.", file=console)
+    elif not stream:
+        print(output)
+
+    if args.profile:
+        print_profile(
+            [
+                (
+                    " ".join(filter(None, [
+                        p.name,
+                        args.accounts and env.account,
+                        args.regions and p.region,
+                    ])),
+                    timing.duration,
+                )
+                for (env, p), (_, timing) in zip(targets, outcomes)
+            ],
+            args.profiler.operations(),
+            total_duration,
+            file=console,
+        )
 
-    print_summary(total_failed)
+    print_summary(total_failed, file=console)
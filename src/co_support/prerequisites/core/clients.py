@@ -0,0 +1,84 @@
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+import boto3
+from botocore.config import Config
+
+from co_support.prerequisites.core.profile import Profiler
+from co_support.prerequisites.core.throttle import AdaptiveLimiter
+
+# Default size of the botocore connection pool of each client.
+MAX_POOL_CONNECTIONS = 10
+
+
+class Clients:
+    """
+    Per-run registry of boto3 clients, created lazily on first use and
+    keyed by service and region, so that every check shares the same
+    clients and connection pools.
+    """
+
+    def __init__(
+        self,
+        session: Optional[boto3.session.Session] = None,
+        concurrency: int = 1,
+        profiler: Optional[Profiler] = None,
+    ) -> None:
+        self.session = session or boto3.session.Session()
+        self.concurrency = concurrency
+        self.profiler = profiler
+        self.config = Config(
+            max_pool_connections=max(MAX_POOL_CONNECTIONS, concurrency),
+        )
+        self._clients: Dict[Tuple[str, str], Any] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def region(self) -> str:
+        """
+        Returns the default region of the session.
+        """
+        return self.session.region_name
+
+    def client(self, service: str, region: Optional[str] = None) -> Any:
+        """
+        Returns the client of a service in a region, defaulting to the
+        session region.
+        """
+        key = (service, region or self.region)
+
+        # boto3 sessions are not thread-safe, clients are.
+        with self._lock:
+            if key not in self._clients:
+                client = self.session.client(
+                    service,
+                    region_name=key[1],
+                    config=self.config,
+                )
+                if self.profiler:
+                    self.profiler.instrument(client)
+                # Throttling is tracked per service and region, where the
+                # AWS rate limits apply.
+                AdaptiveLimiter(
+                    initial=self.concurrency,
+                    maximum=self.config.max_pool_connections,
+                ).instrument(client)
+                self._clients[key] = client
+            return self._clients[key]
+
+    def assume_role(self, role_arn: str) -> "Clients":
+        """
+        Assumes a role and returns a registry of clients using its
+        temporary credentials.
+        """
+        credentials = self.client("sts").assume_role(
+            RoleArn=role_arn,
+            RoleSessionName="co-support",
+        )["Credentials"]
+        session = boto3.session.Session(
+            aws_access_key_id=credentials["AccessKeyId"],
+            aws_secret_access_key=credentials["SecretAccessKey"],
+            aws_session_token=credentials["SessionToken"],
+            region_name=self.region,
+        )
+        return Clients(session, self.concurrency, self.profiler)
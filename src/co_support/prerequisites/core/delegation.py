@@ -0,0 +1,266 @@
+import ipaddress
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import dns.exception
+import dns.flags
+import dns.message
+import dns.name
+import dns.query
+import dns.rcode
+import dns.rdatatype
+import dns.resolver
+
+# Default deadline of each DNS query in seconds.
+DEFAULT_TIMEOUT = 2.0
+
+# Maximum number of parent name server addresses queried.
+MAX_PARENT_SERVERS = 4
+
+Server = Tuple[str, int]
+
+
+class NsAnswer(NamedTuple):
+    """
+    Name servers of a zone as answered by one server, or the error that
+    prevented it from answering.
+    """
+    server: str
+    name_servers: List[str]
+    error: str
+
+
+def parse_server(value: str, port: int = 53) -> Server:
+    """
+    Parses a DNS server given as host, host:port or [ipv6]:port, and
+    resolves a host name to its first address.
+    """
+    if value.startswith("["):
+        host, _, rest = value[1:].partition("]")
+        port = int(rest[1:]) if rest.startswith(":") else port
+    elif value.count(":") == 1:
+        host, _, server_port = value.partition(":")
+        port = int(server_port)
+    else:
+        host = value
+    return _address(host), port
+
+
+def _address(host: str) -> str:
+    try:
+        ipaddress.ip_address(host)
+        return host
+    except ValueError:
+        pass
+    try:
+        return socket.getaddrinfo(host, None, type=socket.SOCK_DGRAM)[0][4][0]
+    except socket.gaierror as e:
+        raise ValueError(f"cannot resolve DNS server {host}: {e.strerror}")
+
+
+def server_label(server: Server) -> str:
+    host, port = server
+    host = f"[{host}]" if ":" in host else host
+    return host if port == 53 else f"{host}:{port}"
+
+
+class DnsCache:
+    """
+    In-process cache of DNS answers, kept for the TTL of the records.
+    """
+
+    def __init__(self) -> None:
+        self._entries: Dict[Tuple, Tuple[float, List[str]]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple) -> Optional[List[str]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if not entry:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[key]
+                return None
+            return entry[1]
+
+    def put(self, key: Tuple, values: List[str], ttl: int) -> None:
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, values)
+
+
+class DelegationVerifier:
+    """
+    Resolves the name servers of a zone through several recursive
+    resolvers and through the authoritative servers of its parent zone,
+    concurrently and with a hard deadline on every query.
+    """
+
+    def __init__(
+        self,
+        resolvers: Optional[List[str]] = None,
+        timeout: float = DEFAULT_TIMEOUT,
+        port: int = 53,
+        cache: Optional[DnsCache] = None,
+    ) -> None:
+        self._resolvers = resolvers
+        self._parsed: Optional[List[Server]] = None
+        self._lock = threading.Lock()
+        self.timeout = timeout
+        self.port = port
+        self.cache = cache or DnsCache()
+
+    @property
+    def resolvers(self) -> List[Server]:
+        """
+        Returns the resolvers, read from the system configuration when none
+        were given. They are only parsed on first use, so that runs that do
+        not check a hosted zone do not need a usable resolver configuration.
+        """
+        with self._lock:
+            if self._parsed is None:
+                resolvers = self._resolvers
+                if resolvers is None:
+                    resolvers = dns.resolver.Resolver().nameservers
+                self._parsed = [parse_server(r) for r in resolvers]
+            return self._parsed
+
+    def name_servers(self, zone_name: str) -> List[NsAnswer]:
+        """
+        Returns the name servers of a zone according to each resolver,
+        followed by each authoritative server of the parent zone.
+        """
+        resolvers = self.resolvers
+        with ThreadPoolExecutor(
+            max_workers=len(resolvers) + MAX_PARENT_SERVERS,
+        ) as executor:
+            resolver_answers = [
+                executor.submit(self._answer, server, zone_name, True)
+                for server in resolvers
+            ]
+            try:
+                parents = self._parent_servers(zone_name)
+            except Exception as e:
+                parents = []
+                parent_error = NsAnswer(
+                    "parent", [], f"parent zone not resolvable ({str(e)})"
+                )
+            else:
+                parent_error = None
+            parent_answers = [
+                executor.submit(self._answer, server, zone_name, False)
+                for server in parents
+            ]
+
+            answers = [f.result() for f in resolver_answers]
+            answers += [
+                answer._replace(server=f"parent {answer.server}")
+                for answer in (f.result() for f in parent_answers)
+            ]
+        if parent_error:
+            answers.append(parent_error)
+        return answers
+
+    def _answer(self, server: Server, name: str, recursive: bool) -> NsAnswer:
+        try:
+            return NsAnswer(
+                server_label(server),
+                self._query(server, name, "NS", recursive),
+                "",
+            )
+        except dns.exception.Timeout:
+            return NsAnswer(server_label(server), [], "timed out")
+        except Exception as e:
+            return NsAnswer(server_label(server), [], str(e))
+
+    def _parent_servers(self, zone_name: str) -> List[Server]:
+        parent = dns.name.from_text(zone_name).parent().to_text()
+        last_error: Exception = ValueError("no resolvers configured")
+        for resolver in self.resolvers:
+            try:
+                hosts = self._query(resolver, parent, "NS", True)
+            except Exception as e:
+                last_error = e
+                continue
+
+            # The name servers are resolved concurrently, and those without
+            # an address are skipped.
+            with ThreadPoolExecutor(
+                max_workers=max(1, len(hosts)),
+            ) as executor:
+                addresses = [
+                    address
+                    for host_addresses in executor.map(
+                        lambda host: self._addresses(resolver, host),
+                        hosts,
+                    )
+                    for address in host_addresses
+                ]
+            if addresses:
+                return [
+                    (address, self.port)
+                    for address in addresses[:MAX_PARENT_SERVERS]
+                ]
+            last_error = ValueError(
+                f"no addresses for the name servers of {parent}"
+            )
+        raise last_error
+
+    def _addresses(self, resolver: Server, host: str) -> List[str]:
+        try:
+            return self._query(resolver, host, "A", True)
+        except Exception:
+            return []
+
+    def _query(
+        self,
+        server: Server,
+        name: str,
+        rdtype: str,
+        recursive: bool,
+    ) -> List[str]:
+        """
+        Sends a single query to a server and returns the sorted values of
+        the matching records, from the answer or from a referral.
+        """
+        key = (server, name.lower(), rdtype, recursive)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        qname = dns.name.from_text(name)
+        qtype = dns.rdatatype.from_text(rdtype)
+        request = dns.message.make_query(qname, qtype)
+        if not recursive:
+            request.flags &= ~dns.flags.RD
+
+        host, port = server
+        response = dns.query.udp(
+            request, host, timeout=self.timeout, port=port,
+        )
+        if response.flags & dns.flags.TC:
+            response = dns.query.tcp(
+                request, host, timeout=self.timeout, port=port,
+            )
+        if response.rcode() != dns.rcode.NOERROR:
+            raise ValueError(dns.rcode.to_text(response.rcode()))
+
+        rrsets = [rrset for rrset in response.answer if rrset.rdtype == qtype]
+        rrsets += [
+            rrset for rrset in response.authority
+            if rrset.rdtype == qtype and rrset.name == qname
+        ]
+        if not rrsets:
+            raise ValueError(f"no {rdtype} records for {name}")
+
+        values = sorted({
+            rdata.to_text().rstrip(".").lower()
+            for rrset in rrsets
+            for rdata in rrset
+        })
+        self.cache.put(key, values, min(rrset.ttl for rrset in rrsets))
+        return values
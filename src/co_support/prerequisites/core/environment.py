@@ -1,4 +1,6 @@
-import boto3
+from typing import List
+
+from co_support.prerequisites.core.clients import Clients
 
 
 class Environment:
@@ -8,7 +10,48 @@ class Environment:
     """
     def __init__(
         self,
+        clients: Clients,
     ) -> None:
-        self.region = boto3.session.Session().region_name
-        self.account = boto3.client("sts").get_caller_identity()["Account"]
-        self.role = boto3.client("sts").get_caller_identity()["Arn"]
+        self.clients = clients
+        identity = clients.client("sts").get_caller_identity()
+        self.region = clients.region
+        self.account = identity["Account"]
+        self.role = identity["Arn"]
+
+    def enabled_regions(self) -> List[str]:
+        """
+        Returns the regions enabled for the current account.
+        """
+        regions = self.clients.client("ec2").describe_regions()["Regions"]
+        return sorted(region["RegionName"] for region in regions)
+
+    def organization_accounts(self) -> List[str]:
+        """
+        Returns the IDs of the active accounts of the organization.
+        """
+        paginator = self.clients.client(
+            "organizations",
+        ).get_paginator("list_accounts")
+        return [
+            account["Id"]
+            for page in paginator.paginate()
+            for account in page["Accounts"]
+            if account["Status"] == "ACTIVE"
+        ]
+
+    def role_arn(self, account: str, role_name: str) -> str:
+        """
+        Returns the ARN of a role in an account, or the account itself
+        when it is already a role ARN.
+        """
+        if account.startswith("arn:"):
+            return account
+
+        partition = self.role.split(":")[1]
+        return f"arn:{partition}:iam::{account}:role/{role_name}"
+
+    def assume_role(self, role_arn: str) -> "Environment":
+        """
+        Returns the environment of a role assumed from this environment.
+        """
+        return Environment(self.clients.assume_role(role_arn))
@@ -0,0 +1,128 @@
+import threading
+from collections import Counter
+from typing import Dict, Iterable, Optional
+
+from co_support.prerequisites.core.clients import Clients
+from co_support.prerequisites.core.quota_rules import ON_DEMAND, quota_usage
+
+# Maximum number of instance types accepted by a single
+# describe_instance_types call.
+INSTANCE_TYPES_BATCH_SIZE = 100
+
+
+class InstanceTypes:
+    """
+    Per-run cache of EC2 instance type metadata for a region.
+    """
+
+    def __init__(
+        self,
+        clients: Clients,
+        region: str,
+    ) -> None:
+        self.clients = clients
+        self.region = region
+        self._types: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+    def describe(self, instance_types: Iterable[str]) -> Dict[str, Dict]:
+        """
+        Returns the metadata of the given instance types, resolving the ones
+        not cached yet in batched describe_instance_types calls.
+        """
+        requested = set(instance_types)
+
+        with self._lock:
+            missing = sorted(requested - self._types.keys())
+            if missing:
+                ec2_client = self.clients.client("ec2", self.region)
+                paginator = ec2_client.get_paginator("describe_instance_types")
+                for i in range(0, len(missing), INSTANCE_TYPES_BATCH_SIZE):
+                    batch = missing[i:i + INSTANCE_TYPES_BATCH_SIZE]
+                    for page in paginator.paginate(InstanceTypes=batch):
+                        for type_info in page["InstanceTypes"]:
+                            self._types[type_info["InstanceType"]] = type_info
+
+            return {name: self._types[name] for name in requested}
+
+    def vcpus(self, instance_types: Iterable[str]) -> Dict[str, int]:
+        """
+        Returns the default number of vCPUs of the given instance types.
+        """
+        return {
+            name: type_info["VCpuInfo"]["DefaultVCpus"]
+            for name, type_info in self.describe(instance_types).items()
+        }
+
+
+class Ec2Inventory:
+    """
+    Per-run snapshot of the pending and running EC2 instances of a region,
+    shared by every check that aggregates over the instance fleet.
+    """
+
+    def __init__(
+        self,
+        clients: Clients,
+        region: str,
+        instance_types: InstanceTypes,
+    ) -> None:
+        self.clients = clients
+        self.region = region
+        self.instance_types = instance_types
+        self._instance_counts: Optional[Counter] = None
+        self._quota_usage: Optional[Counter] = None
+        self._lock = threading.Lock()
+
+    def instance_counts(self) -> Counter:
+        """
+        Returns the number of instances per instance type and lifecycle,
+        scanning the region on first use only.
+        """
+        with self._lock:
+            if self._instance_counts is None:
+                self._instance_counts = self._scan()
+            return self._instance_counts
+
+    def quota_usage(self) -> Counter:
+        """
+        Returns the vCPUs used by the instances against each vCPU quota
+        code, computed once over the unique instance types.
+        """
+        instance_counts = self.instance_counts()
+        with self._lock:
+            if self._quota_usage is None:
+                self._quota_usage = quota_usage(
+                    instance_counts,
+                    self.instance_types.vcpus(
+                        instance_type for instance_type, _ in instance_counts
+                    ),
+                )
+            return self._quota_usage
+
+    def _scan(self) -> Counter:
+        """
+        Paginates describe_instances and counts the instances per type and
+        lifecycle.
+        """
+        ec2_client = self.clients.client("ec2", self.region)
+        paginator = ec2_client.get_paginator("describe_instances")
+        page_iterator = paginator.paginate(
+            Filters=[
+                {
+                    "Name": "instance-state-name",
+                    "Values": ["pending", "running"],
+                }
+            ]
+        )
+
+        instance_counts: Counter = Counter()
+        for page in page_iterator:
+            for reservation in page["Reservations"]:
+                for instance in reservation["Instances"]:
+                    instance_counts[(
+                        instance["InstanceType"],
+                        instance.get("InstanceLifecycle", ON_DEMAND),
+                    )] += 1
+
+        return instance_counts
@@ -1,23 +1,62 @@
+import re
 from abc import ABC, abstractmethod
-from typing import Dict
+from typing import Any, Dict, Hashable, List, Tuple
+
+from co_support.prerequisites.core.clients import Clients
 
 SKIP_PREREQ = (True, "")
 
+# Shared data provider as a callable followed by its arguments, so that
+# equal providers of different checks compare equal.
+Provider = Tuple[Any, ...]
+
 
 class Prerequisite(ABC):
     """
     Represents a prerequisite check with its associated metadata and logic.
     """
 
+    # Names of the attributes the check needs; it is skipped when any of
+    # them is empty.
+    inputs: Tuple[str, ...] = ()
+
     def __init__(
         self,
         name: str,
         description: str,
         reference: str,
+        clients: Clients,
+        region: str = "",
     ) -> None:
         self.name: str = name
+        # Stable identifier of the check for machine-readable output.
+        self.id: str = re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-")
         self.description: str = description
         self.reference: str = reference
+        self.clients: Clients = clients
+        # Empty for global checks that do not depend on the region.
+        self.region: str = region
+
+    def skip(self) -> bool:
+        """
+        Determines whether the check does not apply to the given answers.
+        """
+        return any(not getattr(self, name) for name in self.inputs)
+
+    def providers(self) -> List[Provider]:
+        """
+        Returns the shared data providers the check reads, which are run
+        once ahead of the checks that depend on them.
+        """
+        return []
+
+    def fingerprint(self) -> Hashable:
+        """
+        Returns a cheap summary of the inputs and of the AWS state the
+        check depends on. In watch mode, a passed check is only evaluated
+        again once its fingerprint changes or its result expires.
+        """
+        return tuple(getattr(self, name) for name in self.inputs)
 
     @abstractmethod
     def check(self) -> Dict:
@@ -0,0 +1,104 @@
+import contextvars
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+# Number of API calls made by the function being timed, if any.
+_api_calls: contextvars.ContextVar[Optional[List[int]]] = (
+    contextvars.ContextVar("api_calls", default=None)
+)
+
+
+class Timing(NamedTuple):
+    """
+    Wall-clock timing and number of API calls of a prerequisite check.
+    """
+    started: datetime
+    ended: datetime
+    duration: float
+    api_calls: int = 0
+
+
+def timed(func, *args, **kwargs) -> Tuple[Any, Timing]:
+    """
+    Calls a function and returns its result along with its timing and the
+    number of API calls made by the instrumented clients meanwhile.
+    """
+    api_calls = [0]
+    token = _api_calls.set(api_calls)
+    started = datetime.now(timezone.utc)
+    start = time.perf_counter()
+    try:
+        result = func(*args, **kwargs)
+    finally:
+        _api_calls.reset(token)
+    duration = time.perf_counter() - start
+    return result, Timing(
+        started,
+        datetime.now(timezone.utc),
+        duration,
+        api_calls[0],
+    )
+
+
+def in_context(func: Callable) -> Callable:
+    """
+    Wraps a function to run in a copy of the current context, so that the
+    API calls made from the threads of a check are counted against it.
+    """
+    context = contextvars.copy_context()
+    return lambda *args, **kwargs: context.copy().run(func, *args, **kwargs)
+
+
+class Profiler:
+    """
+    Collects the number of calls and the time spent in each AWS API
+    operation of the instrumented clients.
+    """
+
+    def __init__(self) -> None:
+        self._calls: Dict[str, int] = defaultdict(int)
+        self._durations: Dict[str, float] = defaultdict(float)
+        self._lock = threading.Lock()
+
+    def instrument(self, client: Any) -> None:
+        """
+        Registers the profiler on the events of a boto3 client.
+        """
+        client.meta.events.register("before-call.*.*", self._before_call)
+        client.meta.events.register("after-call.*.*", self._after_call)
+
+    def operations(self) -> List[Tuple[str, int, float]]:
+        """
+        Returns the operation name, number of calls and total duration of
+        each operation, slowest first.
+        """
+        with self._lock:
+            return sorted(
+                (
+                    (operation, self._calls[operation], duration)
+                    for operation, duration in self._durations.items()
+                ),
+                key=lambda operation: operation[2],
+                reverse=True,
+            )
+
+    @staticmethod
+    def _before_call(context: Dict, **kwargs) -> None:
+        context["co_support_started"] = time.perf_counter()
+
+    def _after_call(self, model: Any, context: Dict, **kwargs) -> None:
+        started = context.get("co_support_started")
+        if started is None:
+            return
+
+        duration = time.perf_counter() - started
+        operation = f"{model.service_model.service_name}.{model.name}"
+        api_calls = _api_calls.get()
+        with self._lock:
+            self._calls[operation] += 1
+            self._durations[operation] += duration
+            if api_calls is not None:
+                api_calls[0] += 1
@@ -0,0 +1,160 @@
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, NamedTuple, Tuple
+
+STANDARD_CLASSES = frozenset({"a", "c", "d", "h", "i", "m", "r", "t", "z"})
+
+# Instance classes named by the prefix of the instance family. A family
+# belongs to the longest matching class, so that inf1 is an Inf instance
+# rather than an I one; classes without a vCPU quota rule are not counted.
+INSTANCE_CLASSES = STANDARD_CLASSES | {
+    "dl",
+    "f",
+    "g",
+    "hpc",
+    "inf",
+    "mac",
+    "p",
+    "trn",
+    "u",
+    "vt",
+    "x",
+}
+
+# Lifecycle of the instances launched without a purchase option.
+ON_DEMAND = "on-demand"
+SPOT = "spot"
+
+
+class QuotaRule(NamedTuple):
+    """
+    EC2 vCPU quota and the instance classes and lifecycle it governs.
+    """
+    quota_code: str
+    name: str
+    classes: FrozenSet[str]
+    lifecycle: str = ON_DEMAND
+
+
+QUOTA_RULES: List[QuotaRule] = [
+    QuotaRule(
+        "L-1216C47A",
+        "Running On-Demand Standard (A, C, D, H, I, M, R, T, Z) instances",
+        STANDARD_CLASSES,
+    ),
+    QuotaRule(
+        "L-DB2E81BA",
+        "Running On-Demand G and VT instances",
+        frozenset({"g", "vt"}),
+    ),
+    QuotaRule(
+        "L-417A185B",
+        "Running On-Demand P instances",
+        frozenset({"p"}),
+    ),
+    QuotaRule(
+        "L-1945791B",
+        "Running On-Demand Inf instances",
+        frozenset({"inf"}),
+    ),
+    QuotaRule(
+        "L-6E869C2A",
+        "Running On-Demand DL instances",
+        frozenset({"dl"}),
+    ),
+    QuotaRule(
+        "L-74FC7D96",
+        "Running On-Demand F instances",
+        frozenset({"f"}),
+    ),
+    QuotaRule(
+        "L-7295265B",
+        "Running On-Demand X instances",
+        frozenset({"x"}),
+    ),
+    QuotaRule(
+        "L-34B43A08",
+        "All Standard (A, C, D, H, I, M, R, T, Z) Spot Instance Requests",
+        STANDARD_CLASSES,
+        SPOT,
+    ),
+    QuotaRule(
+        "L-3819A6DF",
+        "All G and VT Spot Instance Requests",
+        frozenset({"g", "vt"}),
+        SPOT,
+    ),
+    QuotaRule(
+        "L-7212CCBC",
+        "All P Spot Instance Requests",
+        frozenset({"p"}),
+        SPOT,
+    ),
+    QuotaRule(
+        "L-B5D1601B",
+        "All Inf Spot Instance Requests",
+        frozenset({"inf"}),
+        SPOT,
+    ),
+    QuotaRule(
+        "L-85EED4F7",
+        "All DL Spot Instance Requests",
+        frozenset({"dl"}),
+        SPOT,
+    ),
+    QuotaRule(
+        "L-88CF9481",
+        "All F Spot Instance Requests",
+        frozenset({"f"}),
+        SPOT,
+    ),
+    QuotaRule(
+        "L-E3A00192",
+        "All X Spot Instance Requests",
+        frozenset({"x"}),
+        SPOT,
+    ),
+]
+
+
+def _rule_index(rules: List[QuotaRule]) -> Dict[Tuple[str, str], List[str]]:
+    index: Dict[Tuple[str, str], List[str]] = {}
+    for rule in rules:
+        for instance_class in rule.classes:
+            index.setdefault((instance_class, rule.lifecycle), []).append(
+                rule.quota_code
+            )
+    return index
+
+
+# Quota codes governing each instance class and lifecycle.
+RULE_INDEX = _rule_index(QUOTA_RULES)
+
+
+@lru_cache(maxsize=None)
+def instance_class(instance_type: str) -> str:
+    """
+    Returns the class of an instance type (e.g., "g" for g4dn.xlarge), or
+    an empty string when it is unknown.
+    """
+    family = instance_type.split(".")[0].lower()
+    matches = [c for c in INSTANCE_CLASSES if family.startswith(c)]
+    return max(matches, key=len, default="")
+
+
+def quota_usage(
+    instance_counts: Counter,
+    vcpus: Dict[str, int],
+) -> Counter:
+    """
+    Returns the vCPUs used against each quota code by the instances,
+    counted per instance type and lifecycle.
+    """
+    usage: Counter = Counter()
+    for (instance_type, lifecycle), count in instance_counts.items():
+        quota_codes = RULE_INDEX.get(
+            (instance_class(instance_type), lifecycle), [],
+        )
+        for quota_code in quota_codes:
+            usage[quota_code] += vcpus[instance_type] * count
+    return usage
@@ -0,0 +1,88 @@
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+from botocore.exceptions import ClientError
+
+from co_support.prerequisites.core.clients import Clients
+
+
+class ServiceQuotas:
+    """
+    Per-run cache of the Service Quotas values of a region, loaded for all
+    the quotas of a service in a single paginated pass and shared by every
+    quota check.
+    """
+
+    def __init__(
+        self,
+        clients: Clients,
+        region: str,
+    ) -> None:
+        self.clients = clients
+        self.region = region
+        self._quotas: Dict[str, Optional[Dict[str, float]]] = {}
+        self._values: Dict[Tuple[str, str], Optional[float]] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def service_quotas(self, service_code: str) -> Optional[Dict[str, float]]:
+        """
+        Returns the applied value of each quota of a service, listing them
+        on first use only, or None when listing them is not allowed.
+        """
+        with self._service_lock(service_code):
+            if service_code not in self._quotas:
+                paginator = self._client().get_paginator(
+                    "list_service_quotas"
+                )
+                try:
+                    self._quotas[service_code] = {
+                        quota["QuotaCode"]: quota["Value"]
+                        for page in paginator.paginate(
+                            ServiceCode=service_code,
+                        )
+                        for quota in page["Quotas"]
+                    }
+                except ClientError as e:
+                    if e.response["Error"]["Code"] != "AccessDeniedException":
+                        raise
+                    # Policies that only allow GetServiceQuota are served
+                    # one quota at a time.
+                    self._quotas[service_code] = None
+            return self._quotas[service_code]
+
+    def value(self, service_code: str, quota_code: str) -> Optional[float]:
+        """
+        Returns the value of a quota, or its AWS default value when it is
+        not listed with an applied value, or None when it does not exist.
+        """
+        quotas = self.service_quotas(service_code)
+        if quotas and quota_code in quotas:
+            return quotas[quota_code]
+
+        key = (service_code, quota_code)
+        with self._service_lock(service_code):
+            if key not in self._values:
+                client = self._client()
+                get_quota = (
+                    client.get_aws_default_service_quota
+                    if quotas is not None
+                    else client.get_service_quota
+                )
+                try:
+                    self._values[key] = get_quota(
+                        ServiceCode=service_code,
+                        QuotaCode=quota_code,
+                    )["Quota"]["Value"]
+                except client.exceptions.NoSuchResourceException:
+                    self._values[key] = None
+            return self._values[key]
+
+    def _service_lock(self, service_code: str) -> threading.Lock:
+        # Each service is loaded under its own lock, so that the quotas of
+        # different services are listed concurrently.
+        with self._lock:
+            return self._locks.setdefault(service_code, threading.Lock())
+
+    def _client(self) -> Any:
+        return self.clients.client("service-quotas", self.region)
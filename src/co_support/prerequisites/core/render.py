@@ -1,7 +1,19 @@
+from typing import List, Optional, TextIO, Tuple
+
 import yaml
 from prettytable import PrettyTable, HRuleStyle, VRuleStyle
 from colorama import Fore, Style
 
+from co_support.prerequisites.core.result import CheckResult
+
+# Column widths of streamed tables, which cannot be fitted to their rows.
+STREAM_WIDTHS = {
+    "Status": 6,
+    "Account": 12,
+    "Region": 14,
+    "Duration": 8,
+}
+
 
 def print_yaml(titles: list[str], data: list[list]) -> str:
     """
@@ -11,36 +23,167 @@ def print_yaml(titles: list[str], data: list[list]) -> str:
     for p in data:
         entry = {titles[i]: p[i] for i in range(len(titles))}
         yaml_data.append(entry)
-    return yaml.dump(yaml_data, default_flow_style=False, width=float("inf"))
+    dumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+    return yaml.dump(
+        yaml_data,
+        Dumper=dumper,
+        default_flow_style=False,
+        # The C emitter takes the width as a C int; never wrap lines.
+        width=2 ** 31 - 1,
+    )
+
+
+def result_row(titles: List[str], result: CheckResult) -> list:
+    """
+    Converts a result into a row with a value for each title.
+    """
+    values = {
+        "Status": result.passed,
+        "Name": result.name,
+        "Account": result.account,
+        "Region": result.region or "global",
+        "Description": result.description,
+        "Result": result.message,
+        "Reference": result.reference,
+        "Started": result.started,
+        "Ended": result.ended,
+        "Duration": f"{result.duration:.2f}s" if result.started else "",
+    }
+    return [values[title] for title in titles]
 
 
-def print_table(titles: list[str], data: list[list]) -> PrettyTable:
+def print_table(
+    titles: list[str],
+    data: list[list],
+    fields: Optional[List[str]] = None,
+) -> PrettyTable:
     """
-    Creates a formatted table using PrettyTable.
+    Creates a formatted table using PrettyTable, displaying only the given
+    fields when provided.
     """
+    table = _table(titles, fields)
+    for p in data:
+        table.add_row(_table_row(p))
+
+    return table
+
+
+class TableStream:
+    """
+    Formats the rows of a table one at a time as they become available,
+    with fixed column widths so that the rows line up under the header.
+    """
+
+    def __init__(
+        self,
+        titles: List[str],
+        fields: Optional[List[str]] = None,
+    ) -> None:
+        self.table = _table(titles, fields)
+        widths = {title: STREAM_WIDTHS.get(title, 30) for title in titles}
+        self.table.min_width = widths
+        self.table.max_width = widths
+
+    def header(self) -> str:
+        """
+        Returns the header of the table.
+        """
+        self.table.clear_rows()
+        self.table.add_row([""] * len(self.table.field_names))
+        return "\n".join(self.table.get_string().splitlines()[:3])
+
+    def row(self, result: CheckResult) -> str:
+        """
+        Returns the row of a result, closed by a horizontal rule.
+        """
+        self.table.clear_rows()
+        self.table.add_row(
+            _table_row(result_row(self.table.field_names, result))
+        )
+        return "\n".join(
+            self.table.get_string(header=False).splitlines()[1:]
+        )
+
+
+def _table(
+    titles: List[str],
+    fields: Optional[List[str]] = None,
+) -> PrettyTable:
     table = PrettyTable()
     table.field_names = titles
+    if fields:
+        table.fields = fields
     table.hrules = HRuleStyle.ALL
     table.vrules = VRuleStyle.ALL
     table.header = True
     table.max_width = 30
     table.align = "c"
     table.valign = "m"
+    return table
 
-    for p in data:
-        table.add_row([("✔" if p[0] else "✘"), *p[1:]])
 
-    return table
+def _table_row(p: list) -> list:
+    return [("✔" if p[0] else "✘"), *p[1:]]
 
 
-def print_summary(total_failed: int) -> None:
+def print_summary(total_failed: int, file: Optional[TextIO] = None) -> None:
     """
     Prints a summary of the prerequisite checks.
     """
     if total_failed == 0:
-        print(Fore.GREEN + "✅ All prerequisites are met!" + Style.RESET_ALL)
+        print(
+            Fore.GREEN + "✅ All prerequisites are met!" + Style.RESET_ALL,
+            file=file,
+        )
     else:
         print(
             Fore.RED + f"❌ {total_failed} prerequisite(s) are missing. "
-            "Please review the results." + Style.RESET_ALL
+            "Please review the results." + Style.RESET_ALL,
+            file=file,
         )
+
+
+def print_profile(
+    checks: List[Tuple[str, float]],
+    operations: List[Tuple[str, int, float]],
+    total: float,
+    file: Optional[TextIO] = None,
+) -> None:
+    """
+    Prints the time spent per check and per AWS operation, slowest first.
+    """
+    print(f"Total time: {total:.2f}s", file=file)
+    print("Time per check:", file=file)
+    for name, duration in sorted(checks, key=lambda c: c[1], reverse=True):
+        print(f"  {duration:8.2f}s  {name}", file=file)
+    print("Time per AWS operation:", file=file)
+    for operation, calls, duration in operations:
+        print(f"  {duration:8.2f}s  {operation} ({calls} calls)", file=file)
+
+
+def print_transitions(
+    transitions: List[Tuple[Optional[CheckResult], Optional[CheckResult]]],
+    file: Optional[TextIO] = None,
+) -> None:
+    """
+    Prints the checks whose status changed between two runs, with the
+    previous and current status of each.
+    """
+    if not transitions:
+        print("No status changes.", file=file)
+    for previous, current in transitions:
+        result = current or previous
+        location = " ".join(filter(None, [result.account, result.region]))
+        color = Fore.GREEN if current and current.passed else Fore.RED
+        print(
+            f"  {_status_symbol(previous)} → "
+            f"{color}{_status_symbol(current)}{Style.RESET_ALL}  "
+            f"{result.name} ({location}): {result.message}",
+            file=file,
+        )
+
+
+def _status_symbol(result: Optional[CheckResult]) -> str:
+    if not result:
+        return "-"
+    return "✔" if result.passed else "✘"
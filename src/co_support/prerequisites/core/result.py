@@ -0,0 +1,62 @@
+import json
+from typing import Any, Dict, List, NamedTuple
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class CheckResult(NamedTuple):
+    """
+    Result of a prerequisite check in an account and region, keyed by
+    field rather than by column.
+
+    The checks only return a message, so detail only holds it under
+    "message". api_calls counts the calls made by the check itself; the
+    calls of the shared providers run ahead of the checks, such as the
+    instance scan, are not attributed to any check.
+    """
+    status: str
+    check: str
+    name: str
+    account: str
+    region: str
+    duration: float
+    api_calls: int
+    detail: Dict[str, Any]
+    description: str = ""
+    reference: str = ""
+    started: str = ""
+    ended: str = ""
+
+    @property
+    def passed(self) -> bool:
+        return self.status == "passed"
+
+    @property
+    def message(self) -> str:
+        return self.detail.get("message", "")
+
+
+def dumps(data: Any) -> str:
+    """
+    Serializes results to compact JSON, with orjson when it is installed.
+    """
+    if orjson:
+        return orjson.dumps(data).decode()
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+
+def to_json(results: List[CheckResult]) -> str:
+    """
+    Converts results into a JSON array.
+    """
+    return dumps([result._asdict() for result in results])
+
+
+def to_ndjson(result: CheckResult) -> str:
+    """
+    Converts a result into a single line of JSON.
+    """
+    return dumps(result._asdict())
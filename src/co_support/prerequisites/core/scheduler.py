@@ -0,0 +1,95 @@
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ThreadPoolExecutor,
+    wait,
+)
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from co_support.prerequisites.core.prerequisite import (
+    SKIP_PREREQ,
+    Prerequisite,
+    Provider,
+)
+from co_support.prerequisites.core.profile import Timing, timed
+
+Outcome = Tuple[Tuple[bool, str], Timing]
+
+
+def run_checks(
+    prerequisites: List[Prerequisite],
+    jobs: int,
+    on_outcome: Optional[Callable[[int, Outcome], None]] = None,
+) -> List[Outcome]:
+    """
+    Runs the prerequisite checks on a bounded thread pool and returns
+    their results and timings in the same order as the given prerequisites.
+
+    The checks that do not apply are skipped without running. The shared
+    data providers of the others are run once, ahead of the checks, and
+    each check starts as soon as all of its providers are done. When given,
+    on_outcome is called on the calling thread with the index and outcome
+    of each check as soon as it is known.
+    """
+    on_outcome = on_outcome or (lambda i, outcome: None)
+    outcomes: List[Optional[Outcome]] = [None] * len(prerequisites)
+    waiting: Dict[int, Set[Provider]] = {}
+    for i, p in enumerate(prerequisites):
+        if p.skip():
+            now = datetime.now(timezone.utc)
+            outcomes[i] = (SKIP_PREREQ, Timing(now, now, 0.0))
+            on_outcome(i, outcomes[i])
+        else:
+            waiting[i] = set(p.providers())
+
+    providers: Set[Provider] = set().union(*waiting.values())
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        running_providers: Dict[Future, Provider] = {
+            executor.submit(_provide, provider): provider
+            for provider in providers
+        }
+        running_checks: Dict[Future, int] = {}
+        done: Set[Provider] = set()
+
+        while True:
+            for i in [i for i, needs in waiting.items() if needs <= done]:
+                del waiting[i]
+                future = executor.submit(timed, _check, prerequisites[i])
+                running_checks[future] = i
+
+            if not running_providers and not running_checks:
+                break
+
+            finished, _ = wait(
+                [*running_providers, *running_checks],
+                return_when=FIRST_COMPLETED,
+            )
+            for future in finished:
+                if future in running_providers:
+                    done.add(running_providers.pop(future))
+                else:
+                    i = running_checks.pop(future)
+                    outcomes[i] = future.result()
+                    on_outcome(i, outcomes[i])
+
+    return outcomes
+
+
+def _check(p: Prerequisite) -> Tuple[bool, str]:
+    # Errors a check does not handle, such as connection errors, fail that
+    # check only rather than the whole run.
+    try:
+        return p.check()
+    except Exception as e:
+        return False, f"Error running check: {str(e)}"
+
+
+def _provide(provider: Provider) -> None:
+    # Failures are left to the checks, which fetch the data again and
+    # report the error in their result.
+    fetch, *args = provider
+    try:
+        fetch(*args)
+    except Exception:
+        pass
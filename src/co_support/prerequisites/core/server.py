@@ -0,0 +1,250 @@
+import json
+import socket
+import threading
+import time
+from argparse import ArgumentTypeError, Namespace
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from co_support.prerequisites.core.answers import Answers
+from co_support.prerequisites.core.checks import (
+    account_access_result,
+    check_result,
+    resolve_targets,
+)
+from co_support.prerequisites.core.result import dumps
+from co_support.prerequisites.core.scheduler import run_checks
+from co_support.prerequisites.core.templates import TemplateCache
+
+# Maximum size of a request body in bytes.
+MAX_BODY_SIZE = 64 * 1024
+
+# Number of seconds a connection may stay idle while a request is read.
+REQUEST_TIMEOUT = 30.0
+
+# Fields of a check request, named after the check-prerequisites flags,
+# with the type of their value.
+REQUEST_FIELDS: Dict[str, type] = {
+    "version": str,
+    "role": str,
+    "domain": str,
+    "zone": str,
+    "cert": str,
+    "private_ca": bool,
+    "vpc": str,
+    "internet_facing": bool,
+    "regions": list,
+    "accounts": list,
+    "account_role": str,
+}
+
+# Fields of a request that are answers to the prerequisite questions.
+ANSWER_FIELDS = [
+    "version",
+    "role",
+    "domain",
+    "zone",
+    "cert",
+    "private_ca",
+    "vpc",
+    "internet_facing",
+]
+
+
+class RequestError(Exception):
+    """
+    Raised when a check request is invalid.
+    """
+
+
+class CheckServer:
+    """
+    Long-lived HTTP server running check requests on a warm client pool,
+    with at most max_runs runs in parallel.
+    """
+
+    def __init__(
+        self,
+        args: Namespace,
+        parsers: Dict[str, Callable[[str], Any]],
+        max_runs: int,
+    ) -> None:
+        self.args = args
+        # Parsers of the fields given as comma-separated strings.
+        self.parsers = parsers
+        self.templates = TemplateCache(offline=args.offline)
+        self._runs = threading.BoundedSemaphore(max_runs)
+        self._server = ThreadingHTTPServer(
+            (args.host, args.port), self._handler(),
+        )
+        self._server.daemon_threads = True
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        return self._server.server_address[:2]
+
+    def serve_forever(self) -> None:
+        self._server.serve_forever()
+
+    def shutdown(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def run(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Runs the checks of a request and returns their results, along
+        with the number of failed checks and the duration of the run.
+        """
+        args = self.request_args(request)
+        try:
+            answers = Answers(
+                {
+                    field: getattr(args, field)
+                    for field in ANSWER_FIELDS
+                    if getattr(args, field) is not None
+                },
+                args,
+            )
+        except ValueError as e:
+            raise RequestError(str(e))
+
+        started = time.perf_counter()
+        targets, errors = resolve_targets(answers, args, self.templates)
+        outcomes = run_checks([p for _, p in targets], args.jobs)
+        results = [
+            account_access_result(role_arn, error)
+            for role_arn, error in errors.items()
+        ]
+        results += [
+            result
+            for result in (
+                check_result(*target, outcome)
+                for target, outcome in zip(targets, outcomes)
+            )
+            if result
+        ]
+        return {
+            "results": [result._asdict() for result in results],
+            "failed": sum(1 for result in results if not result.passed),
+            "duration": round(time.perf_counter() - started, 3),
+        }
+
+    def request_args(self, request: Dict[str, Any]) -> Namespace:
+        """
+        Returns the arguments of a run, as the server arguments overridden
+        by the fields of the request.
+        """
+        unknown = sorted(set(request) - set(REQUEST_FIELDS))
+        if unknown:
+            raise RequestError(f"Unknown fields: {', '.join(unknown)}")
+
+        fields = {"silent": True, "internet_facing": True}
+        for field, value in request.items():
+            if value is None:
+                continue
+            if isinstance(value, list) and REQUEST_FIELDS[field] is list:
+                value = ",".join(str(item) for item in value)
+            if field in self.parsers and isinstance(value, str):
+                try:
+                    value = self.parsers[field](value)
+                except ArgumentTypeError as e:
+                    raise RequestError(f"Invalid {field}: {str(e)}")
+            elif not isinstance(value, REQUEST_FIELDS[field]):
+                raise RequestError(
+                    f"Invalid {field}: expected a "
+                    f"{REQUEST_FIELDS[field].__name__}"
+                )
+            fields[field] = value
+
+        # Fields the request omits fall back to the server arguments, if
+        # any, so that every field the checks read is set.
+        return Namespace(**{
+            **vars(self.args),
+            **{
+                field: getattr(self.args, field, None)
+                for field in REQUEST_FIELDS
+            },
+            **fields,
+        })
+
+    def _handler(self) -> Any:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # Clients sending less of the body than announced would
+            # otherwise hold a handler thread forever.
+            timeout = REQUEST_TIMEOUT
+
+            def do_GET(self) -> None:
+                if self.path != "/health":
+                    return self._reply(HTTPStatus.NOT_FOUND, {
+                        "error": f"Unknown path: {self.path}",
+                    })
+                self._reply(HTTPStatus.OK, {"status": "ok"})
+
+            def do_POST(self) -> None:
+                if self.path != "/checks":
+                    return self._reply(HTTPStatus.NOT_FOUND, {
+                        "error": f"Unknown path: {self.path}",
+                    })
+
+                try:
+                    length = int(self.headers.get("Content-Length") or 0)
+                    if length < 0:
+                        raise ValueError("negative Content-Length")
+                except ValueError as e:
+                    return self._reply(HTTPStatus.BAD_REQUEST, {
+                        "error": f"Invalid Content-Length: {str(e)}",
+                    })
+                if length > MAX_BODY_SIZE:
+                    return self._reply(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {
+                        "error": "Request body is too large.",
+                    })
+                try:
+                    request = json.loads(self.rfile.read(length) or "{}")
+                    if not isinstance(request, dict):
+                        raise RequestError("Expected a JSON object.")
+                except (ValueError, RequestError) as e:
+                    return self._reply(HTTPStatus.BAD_REQUEST, {
+                        "error": f"Invalid request: {str(e)}",
+                    })
+                except socket.timeout:
+                    self.close_connection = True
+                    return self._reply(HTTPStatus.REQUEST_TIMEOUT, {
+                        "error": "Timed out reading the request body.",
+                    })
+
+                if not server._runs.acquire(blocking=False):
+                    return self._reply(
+                        HTTPStatus.TOO_MANY_REQUESTS,
+                        {"error": "Too many runs in progress."},
+                        {"Retry-After": "1"},
+                    )
+                try:
+                    self._reply(HTTPStatus.OK, server.run(request))
+                except RequestError as e:
+                    self._reply(HTTPStatus.BAD_REQUEST, {"error": str(e)})
+                except Exception as e:
+                    self._reply(HTTPStatus.INTERNAL_SERVER_ERROR, {
+                        "error": f"Error running checks: {str(e)}",
+                    })
+                finally:
+                    server._runs.release()
+
+            def _reply(
+                self,
+                status: HTTPStatus,
+                body: Dict[str, Any],
+                headers: Optional[Dict[str, str]] = None,
+            ) -> None:
+                data = dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+        return Handler
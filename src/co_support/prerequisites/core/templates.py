@@ -0,0 +1,151 @@
+import json
+import os
+import sys
+import tempfile
+import threading
+from typing import Dict, Optional
+
+import requests
+import yaml
+
+TEMPLATE_URL = (
+    "https://codeocean-vpc.s3.amazonaws.com/templates/"
+    "{version}/codeocean.template.yaml"
+)
+
+
+def default_cache_dir() -> str:
+    """
+    Returns the per-user directory where templates are cached.
+    """
+    cache_home = os.environ.get(
+        "XDG_CACHE_HOME",
+        os.path.join(os.path.expanduser("~"), ".cache"),
+    )
+    return os.path.join(cache_home, "co-support", "templates")
+
+
+class TemplateCache:
+    """
+    On-disk cache of the AMI mappings of the Code Ocean templates, keyed by
+    version and revalidated against S3 with ETags.
+    """
+
+    def __init__(
+        self,
+        offline: bool = False,
+        cache_dir: Optional[str] = None,
+    ) -> None:
+        self.offline = offline
+        self.cache_dir = cache_dir or default_cache_dir()
+        self._amis: Dict[str, Dict[str, str]] = {}
+        self._lock = threading.Lock()
+
+    def amis(self, version: str) -> Dict[str, str]:
+        """
+        Returns the AMI ID of each supported region for a version, fetching
+        the template at most once per run.
+        """
+        with self._lock:
+            if version not in self._amis:
+                self._amis[version] = self._load(version)
+            return self._amis[version]
+
+    def _load(self, version: str) -> Dict[str, str]:
+        """
+        Reads the cached index of a version and revalidates it, downloading
+        and indexing the template again when it changed.
+        """
+        path = os.path.join(
+            self.cache_dir,
+            f"{version.replace('/', '_')}.json",
+        )
+        entry = self._read(path)
+
+        if self.offline:
+            if entry is None:
+                raise ValueError(
+                    f"Template {version} is not cached. Run once without "
+                    "--offline to cache it."
+                )
+            return entry["amis"]
+
+        headers = {}
+        if entry and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+
+        try:
+            response = requests.get(
+                TEMPLATE_URL.format(version=version),
+                headers=headers,
+                timeout=30,
+            )
+        except requests.RequestException as e:
+            if entry is None:
+                raise
+            # The cached copy is used as with --offline.
+            print(
+                f"Warning: could not revalidate template {version}, using "
+                f"the cached copy: {str(e)}",
+                file=sys.stderr,
+            )
+            return entry["amis"]
+        if response.status_code == 304 and entry:
+            return entry["amis"]
+        response.raise_for_status()
+
+        entry = {
+            "etag": response.headers.get("ETag"),
+            "amis": self._index(response.text),
+        }
+        try:
+            self._save(path, entry)
+        except OSError:
+            # An unwritable cache only costs the next run a download.
+            pass
+        return entry["amis"]
+
+    @staticmethod
+    def _read(path: str) -> Optional[Dict]:
+        """
+        Reads an index entry of the cache directory, or returns None when
+        it is missing or unreadable, so that it is fetched again.
+        """
+        try:
+            with open(path) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(entry, dict) or not isinstance(
+            entry.get("amis"), dict
+        ):
+            return None
+        return entry
+
+    @staticmethod
+    def _index(template: str) -> Dict[str, str]:
+        """
+        Extracts the region to AMI ID mapping from a template.
+        """
+        loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+        content = yaml.load(template, Loader=loader) or {}
+        amis = content.get("Mappings", {}).get("AMIs", {})
+        return {
+            region: mapping.get("id", "")
+            for region, mapping in amis.items()
+            if isinstance(mapping, dict)
+        }
+
+    def _save(self, path: str, entry: Dict) -> None:
+        """
+        Atomically writes an index entry to the cache directory.
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
@@ -0,0 +1,140 @@
+import random
+import threading
+from typing import Any, Dict, Optional
+
+# Error codes returned by the AWS APIs when a caller is rate limited.
+THROTTLING_ERRORS = {
+    "Throttling",
+    "ThrottlingException",
+    "ThrottledException",
+    "RequestThrottled",
+    "RequestThrottledException",
+    "RequestLimitExceeded",
+    "TooManyRequestsException",
+    "EC2ThrottledException",
+    "SlowDown",
+    "PriorRequestNotComplete",
+}
+
+# Attempts of a throttled call before the error is returned to the check.
+MAX_THROTTLED_ATTEMPTS = 10
+
+# Base and maximum delay of the exponential backoff in seconds.
+BACKOFF_BASE = 0.1
+BACKOFF_CAP = 10.0
+
+# Factor applied to the concurrency limit on throttling.
+DECREASE_FACTOR = 0.5
+
+
+class AdaptiveLimiter:
+    """
+    Limits the concurrent API calls of a client with AIMD control: the
+    limit grows by one call for every window of successful calls and is
+    halved on throttling, while throttled calls are retried after a
+    jittered exponential backoff.
+    """
+
+    def __init__(self, initial: int, maximum: int, minimum: int = 1) -> None:
+        self.minimum = minimum
+        self.maximum = maximum
+        self.limit = float(max(minimum, min(initial, maximum)))
+        self.in_flight = 0
+        # Incremented on each decrease, so that the calls already in flight
+        # when the limit was decreased do not decrease it again.
+        self._epoch = 0
+        self._calls = threading.local()
+        self._condition = threading.Condition()
+
+    def instrument(self, client: Any) -> None:
+        """
+        Registers the limiter on the events of a boto3 client, so that
+        every HTTP attempt of the client goes through it.
+        """
+        client.meta.events.register("before-send.*.*", self._before_send)
+        # Registered first so that throttled calls are retried with the
+        # backoff of the limiter rather than with the botocore one.
+        client.meta.events.register_first(
+            "needs-retry.*.*",
+            self._needs_retry,
+        )
+        # Calls that raise before their response is checked for a retry,
+        # e.g. when it cannot be parsed, release their slot here instead.
+        client.meta.events.register(
+            "after-call-error.*.*",
+            self._after_call_error,
+        )
+
+    def acquire(self) -> None:
+        """
+        Blocks until a call can be made within the concurrency limit.
+        """
+        with self._condition:
+            while self.in_flight >= int(self.limit):
+                self._condition.wait()
+            self.in_flight += 1
+            # botocore sends a request and checks its response on the same
+            # thread.
+            self._calls.held = True
+            self._calls.epoch = self._epoch
+
+    def release(self, throttled: Optional[bool]) -> None:
+        """
+        Releases the call of the current thread, if it still holds one, and
+        adjusts the concurrency limit to its outcome, unless it is unknown.
+        """
+        with self._condition:
+            if not getattr(self._calls, "held", False):
+                return
+            self._calls.held = False
+            self.in_flight -= 1
+            if throttled:
+                if getattr(self._calls, "epoch", self._epoch) == self._epoch:
+                    self._epoch += 1
+                    self.limit = max(
+                        self.minimum,
+                        self.limit * DECREASE_FACTOR,
+                    )
+            elif throttled is not None:
+                self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            self._condition.notify_all()
+
+    @staticmethod
+    def backoff(attempts: int) -> float:
+        """
+        Returns the delay before an attempt, with full jitter.
+        """
+        cap = min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempts)
+        return random.uniform(0, cap)
+
+    def _before_send(self, **kwargs) -> None:
+        self.acquire()
+
+    def _needs_retry(
+        self,
+        response: Optional[Any],
+        attempts: int,
+        **kwargs,
+    ) -> Optional[float]:
+        throttled = is_throttled(response)
+        self.release(throttled)
+        if throttled and attempts < MAX_THROTTLED_ATTEMPTS:
+            return self.backoff(attempts)
+        return None
+
+    def _after_call_error(self, **kwargs) -> None:
+        self.release(None)
+
+
+def is_throttled(response: Optional[Any]) -> bool:
+    """
+    Checks if the response of an HTTP attempt is a throttling error.
+    """
+    if not response:
+        return False
+    http_response, parsed = response
+    error: Dict = parsed.get("Error", {}) if parsed else {}
+    return (
+        error.get("Code") in THROTTLING_ERRORS
+        or getattr(http_response, "status_code", None) == 429
+    )
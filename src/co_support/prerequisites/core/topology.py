@@ -0,0 +1,131 @@
+import threading
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from botocore.exceptions import ClientError
+
+from co_support.prerequisites.core.clients import Clients
+
+
+class VpcTopology:
+    """
+    Per-run snapshot of a VPC, or of the default VPC when no VPC ID is
+    given, shared by the network checks. Each resource type is fetched
+    once, filtered server-side, and indexed by ID, except for subnets
+    which are streamed.
+    """
+
+    def __init__(
+        self,
+        clients: Clients,
+        region: str,
+        vpc_id: str,
+    ) -> None:
+        self.clients = clients
+        self.region = region
+        self.vpc_id = vpc_id
+        self._cache: Dict[str, Any] = {}
+        self._lock = threading.RLock()
+
+    def vpc(self) -> Optional[Dict]:
+        """
+        Returns the VPC, or None when it does not exist.
+        """
+        return self._load("vpc", self._fetch_vpc)
+
+    def dhcp_options(self) -> Optional[Dict]:
+        """
+        Returns the DHCP options set associated with the VPC.
+        """
+        return self._load("dhcp_options", self._fetch_dhcp_options)
+
+    def iter_subnets(self) -> Iterator[Dict]:
+        """
+        Streams the subnets of the VPC page by page. Subnets are not kept
+        in the snapshot, so memory stays flat for very large VPCs.
+        """
+        return self._paginate("describe_subnets", "Subnets")
+
+    def route_tables(self) -> Dict[str, Dict]:
+        """
+        Returns the route tables of the VPC indexed by route table ID.
+        """
+        return self._load("route_tables", self._fetch_route_tables)
+
+    def subnet_route_tables(self) -> Dict[str, str]:
+        """
+        Returns the ID of the route table explicitly associated with each
+        subnet.
+        """
+        return self._load(
+            "subnet_route_tables",
+            lambda: {
+                assoc["SubnetId"]: rt_id
+                for rt_id, rt in self.route_tables().items()
+                for assoc in rt.get("Associations", [])
+                if assoc.get("SubnetId")
+            },
+        )
+
+    def main_route_table(self) -> Optional[Dict]:
+        """
+        Returns the main route table of the VPC, used by the subnets without
+        an explicit association.
+        """
+        return next(
+            (
+                rt for rt in self.route_tables().values()
+                if any(
+                    assoc.get("Main") for assoc in rt.get("Associations", [])
+                )
+            ),
+            None,
+        )
+
+    def _load(self, key: str, fetch: Callable[[], Any]) -> Any:
+        # The lock is reentrant since some resources derive from others.
+        with self._lock:
+            if key not in self._cache:
+                self._cache[key] = fetch()
+            return self._cache[key]
+
+    def _ec2(self) -> Any:
+        return self.clients.client("ec2", self.region)
+
+    def _fetch_vpc(self) -> Optional[Dict]:
+        if self.vpc_id:
+            try:
+                vpcs = self._ec2().describe_vpcs(VpcIds=[self.vpc_id])["Vpcs"]
+            except ClientError as e:
+                if e.response["Error"]["Code"] == "InvalidVpcID.NotFound":
+                    return None
+                raise
+        else:
+            vpcs = self._ec2().describe_vpcs(
+                Filters=[{"Name": "is-default", "Values": ["true"]}]
+            )["Vpcs"]
+        return vpcs[0] if vpcs else None
+
+    def _fetch_dhcp_options(self) -> Optional[Dict]:
+        vpc = self.vpc()
+        if not vpc or not vpc.get("DhcpOptionsId"):
+            return None
+        dhcp_options = self._ec2().describe_dhcp_options(
+            DhcpOptionsIds=[vpc["DhcpOptionsId"]]
+        )["DhcpOptions"]
+        return dhcp_options[0] if dhcp_options else None
+
+    def _fetch_route_tables(self) -> Dict[str, Dict]:
+        return {
+            rt["RouteTableId"]: rt
+            for rt in self._paginate("describe_route_tables", "RouteTables")
+        }
+
+    def _paginate(self, operation: str, key: str) -> Iterator[Dict]:
+        vpc = self.vpc()
+        if not vpc:
+            return
+        paginator = self._ec2().get_paginator(operation)
+        for page in paginator.paginate(
+            Filters=[{"Name": "vpc-id", "Values": [vpc["VpcId"]]}]
+        ):
+            yield from page[key]
@@ -0,0 +1,196 @@
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, Hashable, List, NamedTuple, Optional, Tuple
+
+from co_support.prerequisites.core.checks import (
+    account_access_result,
+    build_targets,
+    check_result,
+    resolve_environments,
+)
+from co_support.prerequisites.core.environment import Environment
+from co_support.prerequisites.core.prerequisite import Prerequisite
+from co_support.prerequisites.core.render import (
+    print_summary,
+    print_transitions,
+)
+from co_support.prerequisites.core.result import CheckResult, to_ndjson
+from co_support.prerequisites.core.scheduler import run_checks
+from co_support.prerequisites.core.templates import TemplateCache
+
+# Fingerprint of a check whose fingerprint could not be computed; it never
+# matches, so that the check is evaluated again.
+UNKNOWN = object()
+
+# Number of seconds after which the roles of the accounts are assumed
+# again, before their temporary credentials expire.
+SESSION_LIFETIME = 45 * 60
+
+Key = Tuple[str, str, str]
+
+
+class Entry(NamedTuple):
+    """
+    Last result of a check, along with the fingerprint it was evaluated
+    for and the monotonic time at which it expires.
+    """
+    fingerprint: Hashable
+    result: Optional[CheckResult]
+    expires: float
+
+
+class WatchSession:
+    """
+    Environments, regions and template cache shared by the iterations of
+    a watch, so that the clients, and their connection pools and throttle
+    limiters, stay alive between iterations.
+    """
+
+    def __init__(self, args) -> None:
+        self.args = args
+        self.templates = TemplateCache(offline=args.offline)
+        self.environments: List[Environment] = []
+        self.regions: List[str] = []
+        self.errors: Dict[str, str] = {}
+        self._expires = 0.0
+
+    def refresh(self) -> None:
+        """
+        Assumes the roles of the accounts and lists the regions on first
+        use, and again once the session lifetime has elapsed.
+        """
+        if time.monotonic() < self._expires:
+            return
+        self.environments, self.regions, self.errors = (
+            resolve_environments(self.args)
+        )
+        self._expires = time.monotonic() + SESSION_LIFETIME
+
+
+def watch_prerequisites(answers, args) -> None:
+    """
+    Runs the prerequisite checks every args.watch seconds until
+    interrupted, evaluating again only the checks whose fingerprint
+    changed or whose result expired, and prints the status transitions
+    of each iteration.
+    """
+    console = sys.stderr if args.format == "ndjson" else sys.stdout
+    session = WatchSession(args)
+    entries: Dict[Key, Entry] = {}
+    iteration = 0
+    try:
+        while True:
+            iteration += 1
+            started = time.perf_counter()
+            previous = entries
+            entries, evaluated = watch_iteration(answers, session, previous)
+            transitions = _transitions(previous, entries)
+
+            print(
+                f"[{datetime.now():%H:%M:%S}] Iteration {iteration}: "
+                f"re-evaluated {evaluated} of {len(entries)} checks in "
+                f"{time.perf_counter() - started:.2f}s.",
+                file=console,
+            )
+            print_transitions(transitions, file=console)
+            if args.format == "ndjson":
+                for _, result in transitions:
+                    if result:
+                        print(to_ndjson(result), flush=True)
+
+            print_summary(
+                sum(
+                    1 for entry in entries.values()
+                    if entry.result and not entry.result.passed
+                ),
+                file=console,
+            )
+            console.flush()
+            time.sleep(args.watch)
+    except KeyboardInterrupt:
+        print("Stopped watching.", file=console)
+
+
+def watch_iteration(
+    answers,
+    session: WatchSession,
+    entries: Dict[Key, Entry],
+) -> Tuple[Dict[Key, Entry], int]:
+    """
+    Evaluates the checks whose fingerprint differs from their entry, or
+    whose entry expired, and returns the entries of all the checks along
+    with the number of checks evaluated. Passed results are kept for
+    args.watch_ttl seconds, failed ones only until the next iteration.
+
+    The checks are built again on each iteration, so that their providers
+    fetch fresh data, but on the clients of the session.
+    """
+    args = session.args
+    session.refresh()
+    errors = session.errors
+    targets = build_targets(
+        answers,
+        args,
+        session.environments,
+        session.regions,
+        session.templates,
+    )
+    now = time.monotonic()
+    keys: List[Key] = [(env.account, p.id, p.region) for env, p in targets]
+    with ThreadPoolExecutor(max_workers=args.jobs) as executor:
+        fingerprints = list(executor.map(
+            _fingerprint,
+            [p for _, p in targets],
+        ))
+
+    stale = [
+        i for i, (key, fingerprint) in enumerate(zip(keys, fingerprints))
+        if key not in entries
+        or fingerprint is UNKNOWN
+        or entries[key].fingerprint != fingerprint
+        or entries[key].expires <= now
+    ]
+    outcomes = run_checks([targets[i][1] for i in stale], args.jobs)
+
+    # Roles that cannot be assumed are reported on every iteration.
+    updated: Dict[Key, Entry] = {
+        (role_arn, "account-access", ""): Entry(
+            UNKNOWN, account_access_result(role_arn, error), now,
+        )
+        for role_arn, error in errors.items()
+    }
+    updated.update(
+        (key, entries[key]) for key in keys if key in entries
+    )
+    for i, outcome in zip(stale, outcomes):
+        result = check_result(*targets[i], outcome)
+        ttl = args.watch_ttl if not result or result.passed else 0
+        updated[keys[i]] = Entry(fingerprints[i], result, now + ttl)
+    return updated, len(stale) + len(errors)
+
+
+def _fingerprint(p: Prerequisite) -> Hashable:
+    if p.skip():
+        return None
+    try:
+        return p.fingerprint()
+    except Exception:
+        return UNKNOWN
+
+
+def _transitions(
+    previous: Dict[Key, Entry],
+    entries: Dict[Key, Entry],
+) -> List[Tuple[Optional[CheckResult], Optional[CheckResult]]]:
+    transitions = []
+    for key, entry in entries.items():
+        before = previous[key].result if key in previous else None
+        if _status(before) != _status(entry.result):
+            transitions.append((before, entry.result))
+    return transitions
+
+
+def _status(result: Optional[CheckResult]) -> Optional[str]:
+    return result.status if result else None
@@ -0,0 +1,43 @@
+import os
+import sys
+from typing import Iterator
+
+import pytest
+
+# The fake AWS account and DNS server of the benchmark suite are shared by
+# the tests.
+sys.path.insert(
+    0,
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), "benchmarks"),
+)
+
+from fake_aws import FakeAws  # noqa: E402
+from fake_dns import FakeDns  # noqa: E402
+
+
+@pytest.fixture
+def fake(monkeypatch, tmp_path) -> FakeAws:
+    """
+    Small synthetic AWS account, also serving the Code Ocean template from
+    an empty cache directory.
+    """
+    fake = FakeAws(
+        instances=50,
+        instance_types=10,
+        roles=20,
+        subnets=8,
+        records=20,
+        certificates=5,
+    )
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    monkeypatch.setattr(
+        "co_support.prerequisites.core.templates.requests.get",
+        fake.get_template,
+    )
+    return fake
+
+
+@pytest.fixture
+def fake_dns() -> Iterator[FakeDns]:
+    with FakeDns() as server:
+        yield server
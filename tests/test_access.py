@@ -0,0 +1,59 @@
+from fake_aws import FakeAws
+from bench_checks import environment
+from co_support.prerequisites.checks.access import LinkedRolesCheck
+
+
+def list_roles_params(fake: FakeAws, monkeypatch, page_size: int) -> list:
+    """
+    Serves the roles in pages of the given size and returns the list the
+    parameters of each ListRoles call are appended to.
+    """
+    calls = []
+    list_roles = fake._iam_ListRoles
+
+    def paged(params):
+        calls.append(dict(params))
+        return list_roles({**params, "MaxItems": page_size})
+
+    monkeypatch.setattr(fake, "_iam_ListRoles", paged)
+    return calls
+
+
+def test_only_service_linked_roles_are_listed(fake, fake_dns, monkeypatch):
+    calls = list_roles_params(fake, monkeypatch, page_size=100)
+    args, _ = environment(fake, fake_dns, 1)
+
+    assert LinkedRolesCheck(args.clients).check() == (
+        True, "All required service-linked roles exist.",
+    )
+    assert [params["PathPrefix"] for params in calls] == [
+        "/aws-service-role/",
+    ]
+
+
+def test_listing_stops_once_every_role_is_found(fake, fake_dns, monkeypatch):
+    # Service-linked roles of other services are listed after the required
+    # ones.
+    fake.roles += [
+        fake._role(i, 1) for i in range(len(fake.roles), len(fake.roles) + 4)
+    ]
+    for role in fake.roles[-4:]:
+        role["Path"] = "/aws-service-role/other.amazonaws.com/"
+    calls = list_roles_params(fake, monkeypatch, page_size=2)
+    args, _ = environment(fake, fake_dns, 1)
+
+    assert LinkedRolesCheck(args.clients).check()[0]
+    # The 8 required roles fill 4 pages; the last 2 pages are not read.
+    assert len(calls) == 4
+
+
+def test_missing_roles_are_reported(fake, fake_dns):
+    fake.roles = [
+        role for role in fake.roles
+        if not role["Path"].startswith("/aws-service-role/spot.")
+    ]
+    args, _ = environment(fake, fake_dns, 1)
+
+    assert LinkedRolesCheck(args.clients).check() == (
+        False, "Missing service-linked roles: spot.amazonaws.com.",
+    )
@@ -0,0 +1,78 @@
+import copy
+from argparse import Namespace
+
+from fake_aws import ACCOUNT, REGION
+from bench_checks import environment
+from co_support.prerequisites.checks.access import AdminAccessCheck
+from co_support.prerequisites.core.checks import (
+    account_access_result,
+    assume_accounts,
+    build_prerequisites,
+)
+
+
+class DeniedEnvironment:
+    """
+    Environment in which no role can be assumed.
+    """
+
+    def role_arn(self, account: str, role_name: str) -> str:
+        if account.startswith("arn:"):
+            return account
+        return f"arn:aws:iam::{account}:role/{role_name}"
+
+    def assume_role(self, role_arn: str) -> None:
+        raise PermissionError(f"AccessDenied on {role_arn}")
+
+
+def test_errors_of_roles_in_the_same_account_are_kept():
+    role_arns = [
+        "arn:aws:iam::111111111111:role/Deploy",
+        "arn:aws:iam::111111111111:role/Admin",
+    ]
+    args = Namespace(
+        accounts=role_arns,
+        account_role="OrganizationAccountAccessRole",
+        env=DeniedEnvironment(),
+        jobs=2,
+    )
+
+    environments, errors = assume_accounts(args)
+
+    assert environments == []
+    assert sorted(errors) == sorted(role_arns)
+    results = [account_access_result(*item) for item in errors.items()]
+    assert {result.account for result in results} == {"111111111111"}
+    assert all(
+        role_arn in result.message
+        for role_arn, result in zip(errors, results)
+    )
+
+
+def admin_access_check(answers, args, env) -> AdminAccessCheck:
+    return next(
+        p for p in build_prerequisites(answers, args, env, [REGION])
+        if isinstance(p, AdminAccessCheck)
+    )
+
+
+def test_target_accounts_check_their_assumed_role(fake, fake_dns):
+    args, answers = environment(fake, fake_dns, 1)
+    answers.answers["role"] = f"arn:aws:iam::{ACCOUNT}:role/Deploy"
+    target = copy.copy(args.env)
+    target.account = "222222222222"
+    target.role = (
+        "arn:aws:sts::222222222222:assumed-role/"
+        "OrganizationAccountAccessRole/co-support"
+    )
+
+    assert admin_access_check(answers, args, args.env).role_arn == (
+        f"arn:aws:iam::{ACCOUNT}:role/Deploy"
+    )
+    check = admin_access_check(answers, args, target)
+    assert check.role_arn == target.role
+    assert check.check() == (
+        True,
+        "OrganizationAccountAccessRole has AdministratorAccess policy "
+        "attached.",
+    )
@@ -0,0 +1,142 @@
+from datetime import datetime, timedelta, timezone
+from typing import List, Tuple
+
+import pytest
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.x509.oid import NameOID
+
+from fake_aws import CERTIFICATE_ARN, HOSTING_DOMAIN
+from bench_checks import environment
+from co_support.prerequisites.core.certificates import (
+    discover_certificates,
+    verify_chain,
+)
+
+NOW = datetime.now(timezone.utc)
+
+
+def build_chain(
+    prefix: str = "Test",
+    intermediate_valid: Tuple[datetime, datetime] = (
+        NOW - timedelta(days=1),
+        NOW + timedelta(days=90),
+    ),
+    intermediate_ca: bool = True,
+) -> List[str]:
+    """
+    Returns the PEM leaf, intermediate and root certificates of a chain.
+    """
+    keys = [ec.generate_private_key(ec.SECP256R1()) for _ in range(3)]
+    names = [
+        x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, common_name)])
+        for common_name in [f"{prefix} Root CA", f"{prefix} CA", "leaf"]
+    ]
+    valid = [
+        (NOW - timedelta(days=1), NOW + timedelta(days=90)),
+        intermediate_valid,
+        (NOW - timedelta(days=1), NOW + timedelta(days=90)),
+    ]
+    certs = []
+    for i, (key, name) in enumerate(zip(keys, names)):
+        issuer = max(i - 1, 0)
+        certs.append(
+            x509.CertificateBuilder()
+            .subject_name(name)
+            .issuer_name(names[issuer])
+            .public_key(key.public_key())
+            .serial_number(x509.random_serial_number())
+            .not_valid_before(valid[i][0])
+            .not_valid_after(valid[i][1])
+            .add_extension(
+                x509.BasicConstraints(
+                    ca=i == 0 or (i == 1 and intermediate_ca),
+                    path_length=None,
+                ),
+                critical=True,
+            )
+            .sign(keys[issuer], hashes.SHA256())
+        )
+    leaf, intermediate, root = [
+        cert.public_bytes(serialization.Encoding.PEM).decode()
+        for cert in reversed(certs)
+    ]
+    return [leaf, intermediate, root]
+
+
+def test_full_chain_is_verified():
+    leaf, intermediate, root = build_chain()
+
+    verify_chain(leaf, intermediate + root, partial_chain=False)
+
+
+def test_partial_chain_trusts_the_intermediate():
+    leaf, intermediate, _ = build_chain()
+
+    verify_chain(leaf, intermediate, partial_chain=True)
+
+
+def test_missing_root_is_rejected_without_partial_chain():
+    leaf, intermediate, _ = build_chain()
+
+    with pytest.raises(ValueError, match="unable to get local issuer"):
+        verify_chain(leaf, intermediate, partial_chain=False)
+
+
+@pytest.mark.parametrize("partial_chain", [True, False])
+def test_unrelated_chain_is_rejected(partial_chain):
+    leaf, _, _ = build_chain()
+    _, intermediate, root = build_chain()
+
+    with pytest.raises(ValueError, match="unable to get issuer"):
+        verify_chain(leaf, intermediate + root, partial_chain)
+
+
+def test_issuer_with_the_same_name_and_another_key_is_rejected():
+    leaf, _, _ = build_chain(prefix="Same")
+    _, intermediate, root = build_chain(prefix="Same")
+
+    with pytest.raises(ValueError, match="unable to get issuer"):
+        verify_chain(leaf, intermediate + root, partial_chain=False)
+
+
+@pytest.mark.parametrize("at, error", [
+    (NOW + timedelta(days=11), "has expired"),
+    (NOW + timedelta(days=1), "is not yet valid"),
+])
+def test_intermediate_outside_its_validity_is_rejected(at, error):
+    leaf, intermediate, root = build_chain(intermediate_valid=(
+        NOW + timedelta(days=2),
+        NOW + timedelta(days=10),
+    ))
+
+    with pytest.raises(ValueError, match=error):
+        verify_chain(leaf, intermediate + root, partial_chain=False, at=at)
+    verify_chain(
+        leaf,
+        intermediate + root,
+        partial_chain=False,
+        at=NOW + timedelta(days=5),
+    )
+
+
+def test_non_ca_issuer_is_rejected():
+    leaf, intermediate, root = build_chain(intermediate_ca=False)
+
+    with pytest.raises(ValueError, match="is not a CA"):
+        verify_chain(leaf, intermediate + root, partial_chain=False)
+
+
+def test_discovered_certificates_are_ranked(fake, fake_dns):
+    args, _ = environment(fake, fake_dns, 1)
+
+    certificates = discover_certificates(args.clients, HOSTING_DOMAIN)
+
+    # Covering the domain and *.domain ranks first, ahead of a later
+    # expiry; between equal coverage, the later expiry ranks first.
+    assert [cert["CertificateArn"] for cert in certificates] == [
+        CERTIFICATE_ARN,
+        CERTIFICATE_ARN.replace("000000000000", f"{2:012d}"),
+        CERTIFICATE_ARN.replace("000000000000", f"{1:012d}"),
+    ]
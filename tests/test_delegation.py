@@ -0,0 +1,64 @@
+import dns.message
+import dns.name
+import dns.rdatatype
+import dns.resolver
+import dns.rrset
+import pytest
+
+from fake_aws import ZONE_NAME
+from fake_dns import PARENT_NAME_SERVER, TTL, FakeDns
+from co_support.prerequisites.core.delegation import (
+    DelegationVerifier,
+    parse_server,
+)
+
+# Parent name server without an address record.
+MISSING_NAME_SERVER = "ns.missing.test."
+
+
+class PartialParentDns(FakeDns):
+    """
+    DNS server listing a parent name server that has no address.
+    """
+
+    def answer(self, query: dns.message.Message) -> dns.message.Message:
+        question = query.question[0]
+        parent = dns.name.from_text(ZONE_NAME).parent()
+        if question.rdtype != dns.rdatatype.NS or question.name != parent:
+            return super().answer(query)
+
+        response = dns.message.make_response(query)
+        response.answer.append(dns.rrset.from_text_list(
+            question.name, TTL, "IN", "NS",
+            [MISSING_NAME_SERVER, PARENT_NAME_SERVER],
+        ))
+        return response
+
+
+def test_resolvers_are_read_on_first_use(monkeypatch):
+    def no_configuration():
+        raise dns.resolver.NoResolverConfiguration("no nameservers")
+
+    monkeypatch.setattr(dns.resolver, "Resolver", no_configuration)
+    verifier = DelegationVerifier()
+
+    with pytest.raises(dns.resolver.NoResolverConfiguration):
+        verifier.name_servers(ZONE_NAME)
+
+
+def test_parse_server_resolves_host_names():
+    host, port = parse_server("localhost:5353")
+
+    assert host in ["127.0.0.1", "::1"]
+    assert port == 5353
+    assert parse_server("[::1]:5353") == ("::1", 5353)
+    assert parse_server("10.0.0.2") == ("10.0.0.2", 53)
+
+
+def test_parent_name_servers_without_address_are_skipped():
+    with PartialParentDns() as server:
+        verifier = DelegationVerifier([server.address], 2.0, port=server.port)
+        answers = verifier.name_servers(ZONE_NAME)
+
+    assert [answer.error for answer in answers] == ["", ""]
+    assert answers[1].server == f"parent 127.0.0.1:{server.port}"
@@ -0,0 +1,146 @@
+from fake_aws import (
+    CERTIFICATE_ARN,
+    HOSTED_ZONE_ID,
+    HOSTING_DOMAIN,
+    ZONE_NAME,
+    _record_key,
+)
+from bench_checks import environment
+from co_support.prerequisites.checks.domain import (
+    DISCOVER_CERT,
+    CertificateCheck,
+    HostedZoneCheck,
+)
+from co_support.prerequisites.core.certificates import KEY_TYPES
+
+CODE_OCEAN_RECORDS = [
+    f"{HOSTING_DOMAIN}.",
+    f"registry.{HOSTING_DOMAIN}.",
+    f"analytics.{HOSTING_DOMAIN}.",
+]
+
+
+def hosted_zone_check(args) -> HostedZoneCheck:
+    return HostedZoneCheck(
+        clients=args.clients,
+        hosting_domain=HOSTING_DOMAIN,
+        hosted_zone_id=HOSTED_ZONE_ID,
+        internet_facing=True,
+        delegation=args.delegation,
+    )
+
+
+def record(name: str, record_type: str = "A") -> dict:
+    return {
+        "Name": name,
+        "Type": record_type,
+        "TTL": 300,
+        "ResourceRecords": [{"Value": "203.0.113.10"}],
+    }
+
+
+def test_a_records_are_looked_up_directly(fake, fake_dns, monkeypatch):
+    calls = []
+    list_record_sets = fake._route53_ListResourceRecordSets
+
+    def recorded(params):
+        calls.append(dict(params))
+        return list_record_sets(params)
+
+    monkeypatch.setattr(fake, "_route53_ListResourceRecordSets", recorded)
+    args, _ = environment(fake, fake_dns, 1)
+
+    assert hosted_zone_check(args).check() == (
+        True, "Hosted zone is valid and properly configured.",
+    )
+    assert sorted(calls, key=lambda params: params["StartRecordName"]) == [
+        {
+            "HostedZoneId": HOSTED_ZONE_ID,
+            "StartRecordName": name,
+            "StartRecordType": "A",
+            "MaxItems": "1",
+        }
+        for name in sorted(CODE_OCEAN_RECORDS)
+    ]
+
+
+def test_a_records_beyond_the_first_page_are_found(fake, fake_dns):
+    # 500 records are listed before the analytics record, and the other
+    # names only have records of another type.
+    fake.record_sets = sorted(
+        [
+            *(record(f"a-{i:06d}.{ZONE_NAME}.") for i in range(500)),
+            record(f"{HOSTING_DOMAIN}.", "TXT"),
+            record(f"registry.{HOSTING_DOMAIN}.", "CNAME"),
+            record(f"analytics.{HOSTING_DOMAIN}."),
+        ],
+        key=lambda r: _record_key(r["Name"], r["Type"]),
+    )
+    assert fake.record_sets.index(record(f"analytics.{HOSTING_DOMAIN}.")) > 300
+    args, _ = environment(fake, fake_dns, 1)
+
+    passed, message = hosted_zone_check(args).check()
+
+    assert not passed
+    assert message.startswith("One of the Code Ocean A records was found")
+
+
+def test_records_of_another_type_are_ignored(fake, fake_dns):
+    fake.record_sets = sorted(
+        [
+            record(f"{HOSTING_DOMAIN}.", "TXT"),
+            record(f"registry.{HOSTING_DOMAIN}.", "CNAME"),
+        ],
+        key=lambda r: _record_key(r["Name"], r["Type"]),
+    )
+    args, _ = environment(fake, fake_dns, 1)
+
+    assert hosted_zone_check(args).check()[0]
+
+
+def operations(args) -> dict:
+    return {name: calls for name, calls, _ in args.profiler.operations()}
+
+
+def test_certificate_is_discovered(fake, fake_dns, monkeypatch):
+    calls = []
+    list_certificates = fake._acm_ListCertificates
+
+    def recorded(params):
+        calls.append(dict(params))
+        return list_certificates(params)
+
+    monkeypatch.setattr(fake, "_acm_ListCertificates", recorded)
+    args, _ = environment(fake, fake_dns, 1)
+    check = CertificateCheck(
+        args.clients, DISCOVER_CERT, HOSTING_DOMAIN, private_ca=False,
+    )
+
+    assert check.check() == (
+        True,
+        f"Certificate {CERTIFICATE_ARN} is valid, best of 3 certificates "
+        "covering the domain.",
+    )
+    assert calls == [{
+        "CertificateStatuses": ["ISSUED"],
+        "Includes": {"keyTypes": KEY_TYPES},
+    }]
+    # Only the certificates whose names cover the domain are described.
+    assert operations(args)["acm.DescribeCertificate"] == 3
+
+
+def test_no_certificate_is_discovered(fake, fake_dns):
+    fake.certificates = {
+        arn: cert for arn, cert in fake.certificates.items()
+        if HOSTING_DOMAIN not in cert["SubjectAlternativeNames"]
+    }
+    args, _ = environment(fake, fake_dns, 1)
+    check = CertificateCheck(
+        args.clients, DISCOVER_CERT, HOSTING_DOMAIN, private_ca=False,
+    )
+
+    assert check.check() == (
+        False,
+        f"No issued ACM certificate covers the domain {HOSTING_DOMAIN}.",
+    )
+    assert "acm.DescribeCertificate" not in operations(args)
@@ -0,0 +1,35 @@
+import subprocess
+import sys
+
+from bench_checks import IMPORT_BUDGET_MS, import_time
+
+# Modules that are only loaded once check-prerequisites runs.
+DEFERRED_MODULES = [
+    "boto3",
+    "requests",
+    "dns.resolver",
+    "yaml",
+    "prettytable",
+    "colorama",
+    "cryptography",
+]
+
+
+def test_import_time_within_budget():
+    # The fastest of a few runs, so that a busy machine does not fail it.
+    assert min(import_time() for _ in range(3)) <= IMPORT_BUDGET_MS
+
+
+def test_heavy_modules_are_deferred():
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys, co_support.main; print(' '.join(sys.modules))",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    loaded = set(result.stdout.split())
+    assert not loaded & set(DEFERRED_MODULES)
@@ -0,0 +1,62 @@
+from fake_aws import REGION, SIZES
+from bench_checks import environment
+from co_support.prerequisites.checks.quota import (
+    OnDemandGandVTInstancesQuotaCheck,
+    OnDemandStandardVcpuQuotaCheck,
+)
+from co_support.prerequisites.core import inventory as inventory_module
+from co_support.prerequisites.core.inventory import Ec2Inventory, InstanceTypes
+from co_support.prerequisites.core.quotas import ServiceQuotas
+from co_support.prerequisites.core.scheduler import run_checks
+
+
+def test_instance_types_are_described_in_batches_once(
+    fake, fake_dns, monkeypatch,
+):
+    monkeypatch.setattr(inventory_module, "INSTANCE_TYPES_BATCH_SIZE", 4)
+    batches = []
+    describe_instance_types = fake._ec2_DescribeInstanceTypes
+
+    def recorded(params):
+        batches.append(params["InstanceTypes"])
+        return describe_instance_types(params)
+
+    monkeypatch.setattr(fake, "_ec2_DescribeInstanceTypes", recorded)
+    args, _ = environment(fake, fake_dns, 1)
+    instance_types = InstanceTypes(args.clients, REGION)
+    names = fake.types[:9]
+
+    assert instance_types.vcpus(names + names) == {
+        name: SIZES[name.split(".")[1]] for name in names
+    }
+    assert [len(batch) for batch in batches] == [4, 4, 1]
+
+    # Only the types not cached yet are described.
+    instance_types.vcpus([*names[:3], fake.types[9]])
+    assert batches[3:] == [[fake.types[9]]]
+
+
+def test_vcpu_checks_share_one_instance_scan(fake, fake_dns):
+    fake.instances = 2500
+    args, _ = environment(fake, fake_dns, 2)
+    inventory = Ec2Inventory(
+        args.clients,
+        REGION,
+        InstanceTypes(args.clients, REGION),
+    )
+    quotas = ServiceQuotas(args.clients, REGION)
+    checks = [
+        check(args.clients, REGION, inventory, quotas)
+        for check in [
+            OnDemandStandardVcpuQuotaCheck,
+            OnDemandGandVTInstancesQuotaCheck,
+        ]
+    ]
+
+    outcomes = run_checks(checks, 2)
+
+    assert all(passed for (passed, _), _ in outcomes)
+    calls = {name: calls for name, calls, _ in args.profiler.operations()}
+    # 2500 instances in pages of 1000.
+    assert calls["ec2.DescribeInstances"] == 3
+    assert calls["ec2.DescribeInstanceTypes"] == 1
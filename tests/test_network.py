@@ -0,0 +1,108 @@
+from fake_aws import REGION, VPC_ID
+from bench_checks import environment
+from co_support.prerequisites.checks.network import (
+    DhcpOptionsCheck,
+    ExistingVpcCheck,
+)
+from co_support.prerequisites.core.scheduler import run_checks
+from co_support.prerequisites.core.topology import VpcTopology
+
+
+def operations(args) -> dict:
+    return {name: calls for name, calls, _ in args.profiler.operations()}
+
+
+def record_params(fake, monkeypatch, operation: str, **overrides) -> list:
+    """
+    Returns the list the parameters of each call of a fake EC2 operation
+    are appended to, answering the calls with the given overrides.
+    """
+    calls = []
+    handler = getattr(fake, f"_ec2_{operation}")
+
+    def recorded(params):
+        calls.append(dict(params))
+        return handler({**params, **overrides})
+
+    monkeypatch.setattr(fake, f"_ec2_{operation}", recorded)
+    return calls
+
+
+def network_checks(args, vpc_id: str, internet_facing: bool = True) -> list:
+    topology = VpcTopology(args.clients, REGION, vpc_id)
+    return [
+        DhcpOptionsCheck(args.clients, vpc_id, topology),
+        ExistingVpcCheck(args.clients, vpc_id, internet_facing, topology),
+    ]
+
+
+def test_network_checks_share_one_topology(fake, fake_dns):
+    args, _ = environment(fake, fake_dns, 2)
+
+    outcomes = run_checks(network_checks(args, VPC_ID), 2)
+
+    assert all(passed for (passed, _), _ in outcomes)
+    calls = operations(args)
+    assert calls["ec2.DescribeVpcs"] == 1
+    assert calls["ec2.DescribeDhcpOptions"] == 1
+    assert calls["ec2.DescribeRouteTables"] == 1
+    assert calls["ec2.DescribeSubnets"] == 1
+
+
+def test_topology_is_filtered_server_side(fake, fake_dns, monkeypatch):
+    vpcs = record_params(fake, monkeypatch, "DescribeVpcs")
+    route_tables = record_params(fake, monkeypatch, "DescribeRouteTables")
+    args, _ = environment(fake, fake_dns, 1)
+
+    run_checks(network_checks(args, VPC_ID), 1)
+    dhcp_options, _ = network_checks(args, "")
+    assert dhcp_options.check()[0]
+
+    assert vpcs == [
+        {"VpcIds": [VPC_ID]},
+        {"Filters": [{"Name": "is-default", "Values": ["true"]}]},
+    ]
+    assert route_tables == [
+        {"Filters": [{"Name": "vpc-id", "Values": [VPC_ID]}]},
+    ]
+
+
+def test_subnets_are_streamed_and_counted_once(fake, fake_dns, monkeypatch):
+    subnets = record_params(fake, monkeypatch, "DescribeSubnets", MaxResults=3)
+    args, _ = environment(fake, fake_dns, 1)
+    _, existing_vpc = network_checks(args, VPC_ID)
+
+    assert existing_vpc.check() == (
+        True,
+        "VPC has the required subnets and the correct internet access "
+        "configurations. Private Subnets: 4, Public Subnets: 4",
+    )
+    # 8 subnets in pages of 3.
+    assert len(subnets) == 3
+
+
+def test_route_errors_are_bounded(fake, fake_dns, monkeypatch):
+    fake.subnets = 20
+    describe_route_tables = fake._ec2_DescribeRouteTables
+
+    def without_public_associations(params):
+        response = describe_route_tables(params)
+        for rt in response["RouteTables"]:
+            if rt["RouteTableId"] == "rtb-0public":
+                rt["Associations"] = []
+        return response
+
+    monkeypatch.setattr(
+        fake, "_ec2_DescribeRouteTables", without_public_associations,
+    )
+    args, _ = environment(fake, fake_dns, 1)
+    _, existing_vpc = network_checks(args, VPC_ID)
+
+    passed, message = existing_vpc.check()
+
+    assert not passed
+    assert message.startswith(
+        "Less than 2 public subnets have proper internet access."
+    )
+    # Only the first 5 of the 10 public subnets are reported.
+    assert message.count("does not have a valid IGW route") == 5
@@ -0,0 +1,76 @@
+import json
+import threading
+from typing import Dict, List
+
+from bench_checks import environment
+from co_support.prerequisites.core.checks import check_prerequisites
+from co_support.prerequisites.core.prerequisite import Prerequisite
+from co_support.prerequisites.core.scheduler import run_checks
+
+
+class EventCheck(Prerequisite):
+    """
+    Check that passes once its event is set.
+    """
+
+    def __init__(self, name: str, event: threading.Event) -> None:
+        super().__init__(name, "", "", None)
+        self.event = event
+
+    def check(self) -> Dict:
+        assert self.event.wait(timeout=10)
+        return True, self.name
+
+
+def test_outcomes_are_reported_as_checks_complete():
+    slow = threading.Event()
+    fast = threading.Event()
+    fast.set()
+    reported: List[int] = []
+
+    def on_outcome(i, outcome) -> None:
+        reported.append(i)
+        # The slow check only completes once the fast one is reported.
+        slow.set()
+
+    outcomes = run_checks(
+        [EventCheck("Slow", slow), EventCheck("Fast", fast)],
+        jobs=2,
+        on_outcome=on_outcome,
+    )
+
+    assert reported == [1, 0]
+    assert [message for (_, message), _ in outcomes] == ["Slow", "Fast"]
+
+
+def test_stream_prints_each_row_once(fake, fake_dns, tmp_path, capsys):
+    args, answers = environment(fake, fake_dns, 4)
+    args.stream = True
+    check_prerequisites(answers, args)
+    out = capsys.readouterr().out
+
+    assert out.index("Status") < out.index("Administrator Access")
+    assert out.count("Administrator Access") == 1
+    assert "All prerequisites are met!" in out
+
+    # The output file holds the results in declared order.
+    args, answers = environment(fake, fake_dns, 4)
+    args.stream = True
+    args.output = str(tmp_path)
+    check_prerequisites(answers, args)
+    table = (tmp_path / "results.table").read_text()
+    names = ["Administrator Access", "Shared AMI", "Service Linked Roles"]
+    assert sorted(names, key=table.index) == names
+
+
+def test_ndjson_streams_one_record_per_line(fake, fake_dns, capsys):
+    args, answers = environment(fake, fake_dns, 4)
+    args.format = "ndjson"
+    check_prerequisites(answers, args)
+    captured = capsys.readouterr()
+
+    records = [json.loads(line) for line in captured.out.splitlines()]
+    assert len(records) == len({record["check"] for record in records})
+    assert "administrator-access" in {record["check"] for record in records}
+    assert "Starting prerequisite checks..." in captured.err
+    assert "All prerequisites are met!" in captured.err
@@ -0,0 +1,71 @@
+from collections import Counter
+
+import pytest
+
+from co_support.prerequisites.core.quota_rules import (
+    ON_DEMAND,
+    SPOT,
+    instance_class,
+    quota_usage,
+)
+
+
+@pytest.mark.parametrize("instance_type, expected", [
+    ("inf1.xlarge", "inf"),
+    ("inf2.8xlarge", "inf"),
+    ("i3.large", "i"),
+    ("im4gn.large", "i"),
+    ("dl1.24xlarge", "dl"),
+    ("d3en.xlarge", "d"),
+    ("trn1n.32xlarge", "trn"),
+    ("t3.micro", "t"),
+    ("mac1.metal", "mac"),
+    ("m5.large", "m"),
+    ("hpc7g.4xlarge", "hpc"),
+    ("h1.2xlarge", "h"),
+    ("u-6tb1.metal", "u"),
+    ("vt1.3xlarge", "vt"),
+    ("g4dn.xlarge", "g"),
+    ("x2idn.16xlarge", "x"),
+    ("z1d.large", "z"),
+    ("P4D.24XLARGE", "p"),
+    ("q9.large", ""),
+])
+def test_instance_class_matches_the_longest_prefix(instance_type, expected):
+    assert instance_class(instance_type) == expected
+
+
+def test_quota_usage_is_counted_per_class_and_lifecycle():
+    instance_counts = Counter({
+        ("m5.large", ON_DEMAND): 2,
+        ("i3.large", ON_DEMAND): 1,
+        ("m5.large", SPOT): 3,
+        ("g4dn.xlarge", ON_DEMAND): 1,
+        ("vt1.3xlarge", SPOT): 1,
+        ("inf1.xlarge", ON_DEMAND): 2,
+        # Classes without a quota rule, and unknown classes, are ignored.
+        ("trn1.2xlarge", ON_DEMAND): 1,
+        ("mac1.metal", ON_DEMAND): 1,
+        ("q9.large", ON_DEMAND): 4,
+    })
+    vcpus = {
+        "m5.large": 2,
+        "i3.large": 2,
+        "g4dn.xlarge": 4,
+        "vt1.3xlarge": 12,
+        "inf1.xlarge": 4,
+        "trn1.2xlarge": 8,
+        "mac1.metal": 12,
+        "q9.large": 2,
+    }
+
+    assert quota_usage(instance_counts, vcpus) == Counter({
+        # Standard On-Demand and Spot.
+        "L-1216C47A": 6,
+        "L-34B43A08": 6,
+        # G and VT On-Demand and Spot.
+        "L-DB2E81BA": 4,
+        "L-3819A6DF": 12,
+        # Inf On-Demand.
+        "L-1945791B": 8,
+    })
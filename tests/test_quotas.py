@@ -0,0 +1,40 @@
+from fake_aws import QUOTAS, REGION, FakeError
+from bench_checks import environment
+from co_support.prerequisites.core.quotas import ServiceQuotas
+
+
+def operations(args) -> dict:
+    return {name: calls for name, calls, _ in args.profiler.operations()}
+
+
+def test_quotas_are_listed_once(fake, fake_dns):
+    args, _ = environment(fake, fake_dns, 1)
+    quotas = ServiceQuotas(args.clients, REGION)
+
+    for service, code in QUOTAS:
+        assert quotas.value(service, code) == QUOTAS[(service, code)]
+    assert quotas.value("ec2", "L-UNKNOWN") is None
+
+    calls = operations(args)
+    assert calls["service-quotas.ListServiceQuotas"] == 2
+    assert calls["service-quotas.GetAWSDefaultServiceQuota"] == 1
+    assert "service-quotas.GetServiceQuota" not in calls
+
+
+def test_denied_listing_falls_back_to_get_service_quota(
+    fake, fake_dns, monkeypatch,
+):
+    def deny(params):
+        raise FakeError(400, "AccessDeniedException", "not authorized")
+
+    monkeypatch.setattr(fake, "_service_quotas_ListServiceQuotas", deny)
+    monkeypatch.setattr(
+        fake, "_service_quotas_GetAWSDefaultServiceQuota", deny,
+    )
+    args, _ = environment(fake, fake_dns, 1)
+    quotas = ServiceQuotas(args.clients, REGION)
+
+    assert quotas.value("ec2", "L-1216C47A") == QUOTAS[("ec2", "L-1216C47A")]
+    assert quotas.value("ec2", "L-1216C47A") == QUOTAS[("ec2", "L-1216C47A")]
+    assert quotas.value("ec2", "L-UNKNOWN") is None
+    assert operations(args)["service-quotas.GetServiceQuota"] == 2
@@ -0,0 +1,18 @@
+from fake_aws import REGION
+from bench_checks import environment
+from co_support.prerequisites.core.checks import build_prerequisites
+
+# Checks of services without regions.
+GLOBAL_CHECKS = {
+    "administrator-access",
+    "service-linked-roles",
+    "hosted-zone",
+}
+
+
+def test_only_global_checks_have_no_region(fake, fake_dns):
+    args, answers = environment(fake, fake_dns, 1)
+    prerequisites = build_prerequisites(answers, args, args.env, [REGION])
+
+    assert {p.id for p in prerequisites if not p.region} == GLOBAL_CHECKS
+    assert {p.region for p in prerequisites if p.region} == {REGION}
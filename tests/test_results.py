@@ -0,0 +1,69 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+from fake_aws import ACCOUNT, HOSTED_ZONE_ID, HOSTING_DOMAIN
+from bench_checks import environment
+from co_support.prerequisites.checks.domain import HostedZoneCheck
+from co_support.prerequisites.core.checks import check_prerequisites
+from co_support.prerequisites.core.profile import in_context, timed
+from co_support.prerequisites.core.result import CheckResult
+
+
+def test_api_calls_are_attributed_to_the_timed_check(fake, fake_dns):
+    args, _ = environment(fake, fake_dns, 1)
+    sts = args.clients.client("sts")
+
+    def identity():
+        return sts.get_caller_identity()["Account"]
+
+    def in_thread(wrap):
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(wrap(identity)).result()
+
+    assert timed(identity)[1].api_calls == 1
+    # Threads only count against the check when started in its context.
+    assert timed(in_thread, in_context)[1].api_calls == 1
+    assert timed(in_thread, lambda func: func)[1].api_calls == 0
+    # Calls made outside of a timed function are not counted.
+    identity()
+    assert timed(lambda: None)[1].api_calls == 0
+
+
+def test_hosted_zone_check_counts_its_parallel_lookups(fake, fake_dns):
+    args, _ = environment(fake, fake_dns, 1)
+    check = HostedZoneCheck(
+        clients=args.clients,
+        hosting_domain=HOSTING_DOMAIN,
+        hosted_zone_id=HOSTED_ZONE_ID,
+        internet_facing=True,
+        delegation=args.delegation,
+    )
+
+    (passed, _), timing = timed(check.check)
+
+    assert passed
+    # GetHostedZone and one record lookup per Code Ocean name.
+    assert timing.api_calls == 4
+
+
+def test_json_output_is_an_array_of_records(fake, fake_dns, capsys):
+    args, answers = environment(fake, fake_dns, 4)
+    args.format = "json"
+    check_prerequisites(answers, args)
+    captured = capsys.readouterr()
+
+    records = json.loads(captured.out)
+    assert [set(record) for record in records] == (
+        [set(CheckResult._fields)] * len(records)
+    )
+    results = [CheckResult(**record) for record in records]
+    assert all(result.passed for result in results)
+    assert {result.account for result in results} == {ACCOUNT}
+    assert all(set(result.detail) == {"message"} for result in results)
+    assert all(result.message for result in results)
+    admin_access = next(
+        result for result in results if result.check == "administrator-access"
+    )
+    # The check lists the policies of the role.
+    assert admin_access.api_calls == 1
+    assert "All prerequisites are met!" in captured.err
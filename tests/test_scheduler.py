@@ -0,0 +1,42 @@
+from typing import Dict
+
+from botocore.exceptions import EndpointConnectionError
+
+from co_support.prerequisites.core.prerequisite import Prerequisite
+from co_support.prerequisites.core.scheduler import run_checks
+
+
+class StubCheck(Prerequisite):
+    def __init__(self, name: str, fail: bool = False) -> None:
+        super().__init__(name, "", "", None)
+        self.fail = fail
+
+    def check(self) -> Dict:
+        if self.fail:
+            raise EndpointConnectionError(endpoint_url="https://iam.test")
+        return True, ""
+
+
+def test_check_errors_fail_that_check_only():
+    prerequisites = [
+        StubCheck("First"),
+        StubCheck("Unreachable", fail=True),
+        StubCheck("Last"),
+    ]
+    reported = []
+
+    outcomes = run_checks(
+        prerequisites,
+        jobs=2,
+        on_outcome=lambda i, outcome: reported.append(i),
+    )
+
+    results = [result for result, _ in outcomes]
+    assert results[0] == (True, "")
+    assert results[1] == (
+        False,
+        "Error running check: Could not connect to the endpoint URL: "
+        '"https://iam.test"',
+    )
+    assert results[2] == (True, "")
+    assert sorted(reported) == [0, 1, 2]
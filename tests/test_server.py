@@ -0,0 +1,98 @@
+import http.client
+import json
+import threading
+from argparse import ArgumentParser
+from typing import Any, Dict, Iterator, Tuple
+
+import pytest
+
+from bench_checks import environment
+from co_support.prerequisites.cmd import commands, comma_list
+from co_support.prerequisites.core import server as server_module
+from co_support.prerequisites.core.server import CheckServer
+
+
+@pytest.fixture
+def server(fake, fake_dns, monkeypatch) -> Iterator[CheckServer]:
+    """
+    Check server on a random port, with the arguments of the serve command
+    and the clients of the fake account.
+    """
+    parser = ArgumentParser()
+    commands(parser.add_subparsers())
+    args = parser.parse_args([
+        "serve",
+        "--port", "0",
+        "--max-runs", "1",
+        "--dns-resolvers", fake_dns.address,
+    ])
+    monkeypatch.setattr(server_module, "REQUEST_TIMEOUT", 0.5)
+    fake_args, _ = environment(fake, fake_dns, args.jobs)
+    for name in ["profiler", "clients", "env", "delegation"]:
+        setattr(args, name, getattr(fake_args, name))
+
+    server = CheckServer(
+        args,
+        parsers={
+            "regions": comma_list("all"),
+            "accounts": comma_list("organization"),
+        },
+        max_runs=args.max_runs,
+    )
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+
+
+def post(
+    server: CheckServer,
+    body: bytes,
+    headers: Dict[str, str],
+) -> Tuple[int, Any]:
+    connection = http.client.HTTPConnection(*server.address, timeout=30)
+    connection.putrequest("POST", "/checks")
+    for name, value in headers.items():
+        connection.putheader(name, value)
+    connection.endheaders(body)
+    response = connection.getresponse()
+    return response.status, json.loads(response.read())
+
+
+def test_minimal_request(server):
+    body = json.dumps({"version": "v1", "regions": ["us-east-1"]}).encode()
+    status, response = post(
+        server, body, {"Content-Length": str(len(body))},
+    )
+
+    assert status == 200
+    assert response["results"]
+    assert {r["check"] for r in response["results"]} >= {
+        "administrator-access",
+        "on-demand-standard-instances",
+    }
+
+
+def test_missing_version(server):
+    body = json.dumps({"regions": ["us-east-1"]}).encode()
+    status, response = post(
+        server, body, {"Content-Length": str(len(body))},
+    )
+
+    assert status == 400
+    assert "Version" in response["error"]
+
+
+@pytest.mark.parametrize("length", ["abc", "-1"])
+def test_invalid_content_length(server, length):
+    status, response = post(server, b"", {"Content-Length": length})
+
+    assert status == 400
+    assert "Content-Length" in response["error"]
+
+
+def test_truncated_body_times_out(server):
+    status, response = post(server, b"{}", {"Content-Length": "100"})
+
+    assert status == 408
+    assert "Timed out" in response["error"]
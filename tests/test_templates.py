@@ -0,0 +1,43 @@
+import pytest
+import requests
+
+from fake_aws import REGION
+from co_support.prerequisites.core.templates import TemplateCache
+
+
+@pytest.mark.parametrize("content", ['{"etag": "\\"bench\\"", "am', "[]"])
+def test_corrupt_entry_is_fetched_again(fake, tmp_path, content):
+    (tmp_path / "v1.json").write_text(content)
+    cache = TemplateCache(cache_dir=str(tmp_path))
+
+    assert cache.amis("v1")[REGION].startswith("ami-")
+    # The entry is replaced by a valid one.
+    assert TemplateCache(cache_dir=str(tmp_path), offline=True).amis("v1")
+
+
+def test_corrupt_entry_is_not_cached_offline(tmp_path):
+    (tmp_path / "v1.json").write_text("{")
+    cache = TemplateCache(cache_dir=str(tmp_path), offline=True)
+
+    with pytest.raises(ValueError, match="not cached"):
+        cache.amis("v1")
+
+
+def test_cached_entry_is_used_when_revalidation_fails(
+    fake, tmp_path, monkeypatch, capsys,
+):
+    TemplateCache(cache_dir=str(tmp_path)).amis("v1")
+
+    def unreachable(url, **kwargs):
+        raise requests.ConnectionError("connection refused")
+
+    monkeypatch.setattr(
+        "co_support.prerequisites.core.templates.requests.get",
+        unreachable,
+    )
+    cache = TemplateCache(cache_dir=str(tmp_path))
+
+    assert cache.amis("v1")[REGION].startswith("ami-")
+    assert "using the cached copy" in capsys.readouterr().err
+    with pytest.raises(requests.ConnectionError):
+        TemplateCache(cache_dir=str(tmp_path)).amis("v2")
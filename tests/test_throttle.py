@@ -0,0 +1,165 @@
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List
+
+import boto3
+import pytest
+from botocore.awsrequest import AWSResponse
+from botocore.exceptions import ClientError
+
+from co_support.prerequisites.core import clients as clients_module
+from co_support.prerequisites.core.clients import Clients
+from co_support.prerequisites.core.throttle import (
+    MAX_THROTTLED_ATTEMPTS,
+    AdaptiveLimiter,
+)
+
+
+class Raw:
+    def __init__(self, body: bytes) -> None:
+        self.body = body
+
+    def stream(self, **kwargs) -> Any:
+        yield self.body
+
+
+class ThrottlingService:
+    """
+    Service Quotas stand-in answering at the HTTP layer, which throttles
+    the given number of attempts before answering, alternating between a
+    Throttling error and a bare 429.
+    """
+
+    def __init__(self, throttled: int) -> None:
+        self.throttled = throttled
+        self.attempts = 0
+        self.limits: List[float] = []
+        self.limiter: AdaptiveLimiter = None
+        self._lock = threading.Lock()
+
+    def __call__(self, request: Any, **kwargs) -> AWSResponse:
+        with self._lock:
+            self.attempts += 1
+            self.limits.append(self.limiter.limit)
+            throttled = self.throttled
+            self.throttled = max(0, throttled - 1)
+        if throttled:
+            if throttled % 2:
+                return self._response(429, {})
+            return self._response(400, {
+                "__type": "ThrottlingException",
+                "message": "Rate exceeded",
+            })
+        return self._response(200, {"Quota": {"Value": 5.0}})
+
+    @staticmethod
+    def _response(status: int, body: dict) -> AWSResponse:
+        return AWSResponse(
+            "https://servicequotas.us-east-1.amazonaws.com/",
+            status,
+            {"Content-Type": "application/x-amz-json-1.1"},
+            Raw(json.dumps(body).encode()),
+        )
+
+
+@pytest.fixture
+def service(monkeypatch) -> Any:
+    """
+    Returns a function creating a Service Quotas client of a client
+    registry, answered by a throttling service.
+    """
+    monkeypatch.setattr(AdaptiveLimiter, "backoff", staticmethod(
+        lambda attempts: 0.0
+    ))
+    limiters: List[AdaptiveLimiter] = []
+
+    class Limiter(AdaptiveLimiter):
+        def __init__(self, *args, **kwargs) -> None:
+            super().__init__(*args, **kwargs)
+            limiters.append(self)
+
+    monkeypatch.setattr(clients_module, "AdaptiveLimiter", Limiter)
+
+    def create(throttled: int) -> Any:
+        session = boto3.session.Session(
+            region_name="us-east-1",
+            aws_access_key_id="test",
+            aws_secret_access_key="test",
+        )
+        client = Clients(session, concurrency=8).client("service-quotas")
+        fake = ThrottlingService(throttled)
+        fake.limiter = limiters[-1]
+        # Registered after the limiter, so that every attempt goes
+        # through it.
+        client.meta.events.register("before-send.*.*", fake)
+        return client, fake
+
+    return create
+
+
+def get_quota(client: Any) -> float:
+    return client.get_service_quota(
+        ServiceCode="ec2",
+        QuotaCode="L-0263D0A3",
+    )["Quota"]["Value"]
+
+
+def test_throttled_calls_are_retried(service):
+    client, fake = service(throttled=3)
+
+    assert get_quota(client) == 5.0
+    assert fake.attempts == 4
+    # The limit is halved on each throttled attempt.
+    assert fake.limits == [8, 4, 2, 1]
+
+
+def test_limit_grows_back_after_throttling(service):
+    client, fake = service(throttled=3)
+    get_quota(client)
+    assert fake.limiter.limit == 2
+
+    for _ in range(50):
+        assert get_quota(client) == 5.0
+
+    assert fake.limiter.limit == fake.limiter.maximum
+    assert fake.limiter.in_flight == 0
+
+
+def test_concurrent_throttled_calls_succeed(service):
+    client, fake = service(throttled=16)
+
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        quotas = list(executor.map(lambda _: get_quota(client), range(32)))
+
+    assert quotas == [5.0] * 32
+    assert min(fake.limits) < fake.limiter.maximum
+    assert fake.limiter.in_flight == 0
+
+
+def test_persistent_throttling_fails_after_max_attempts(service):
+    client, fake = service(throttled=1000)
+
+    with pytest.raises(ClientError):
+        get_quota(client)
+    assert fake.attempts == MAX_THROTTLED_ATTEMPTS
+    assert fake.limiter.in_flight == 0
+
+
+def test_failed_responses_release_their_slot(service):
+    client, fake = service(throttled=0)
+
+    def fail(**kwargs) -> None:
+        raise ValueError("unparseable response")
+
+    # Raised after the send and before the retry check.
+    client.meta.events.register("before-parse.*.*", fail)
+    fake.limiter.limit = 1
+    for _ in range(3):
+        with pytest.raises(ValueError):
+            get_quota(client)
+
+    assert fake.limiter.in_flight == 0
+    assert fake.limiter.limit == 1
+    client.meta.events.unregister("before-parse.*.*", fail)
+    assert get_quota(client) == 5.0
@@ -0,0 +1,46 @@
+from argparse import ArgumentParser
+from unittest import mock
+
+import pytest
+
+from bench_checks import environment
+from co_support.prerequisites.cmd import commands
+from co_support.prerequisites.core import watch
+
+
+def test_session_is_resolved_once(fake, fake_dns):
+    args, answers = environment(fake, fake_dns, 4)
+    session = watch.WatchSession(args)
+    entries = {}
+
+    with mock.patch.object(
+        watch,
+        "resolve_environments",
+        wraps=watch.resolve_environments,
+    ) as resolve:
+        entries, evaluated = watch.watch_iteration(answers, session, entries)
+        clients = dict(args.clients._clients)
+        entries, reevaluated = watch.watch_iteration(answers, session, entries)
+
+    assert resolve.call_count == 1
+    assert evaluated == len(entries)
+    failed = [e for e in entries.values() if e.result and not e.result.passed]
+    assert reevaluated == len(failed)
+    # The clients, and their throttle limiters, are kept between iterations.
+    assert all(args.clients._clients[key] is c for key, c in clients.items())
+
+
+@pytest.mark.parametrize("flag", [
+    ["-o", "."],
+    ["--stream"],
+    ["--profile"],
+    ["-f", "json"],
+])
+def test_watch_rejects_ignored_flags(flag, capsys):
+    parser = ArgumentParser()
+    commands(parser.add_subparsers())
+    args = parser.parse_args(["check-prerequisites", "--watch", "5", *flag])
+
+    with pytest.raises(SystemExit):
+        args.cmd(args)
+    assert "--watch cannot be combined" in capsys.readouterr().err